@@ -0,0 +1,333 @@
+"""
+Alert Engine Module
+Streaming alert rules with sliding windows, hysteresis and rate limiting
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+
+
+class SlidingWindow:
+    """Time-based window with O(1) avg/max/percentile updates per sample
+
+    Percentiles use a fixed histogram of `buckets` slots between 0 and
+    `max_value`, so a query costs the same no matter how many samples the
+    window holds. Values above `max_value` land in the last bucket.
+    """
+
+    def __init__(self, seconds, max_value=100.0, buckets=200):
+        self.seconds = seconds
+        self.max_value = max_value
+        self.bucket_width = max_value / buckets
+        self.histogram = [0] * (buckets + 1)
+        self.samples = deque()
+        self.max_candidates = deque()
+        self.total = 0.0
+
+    def bucket(self, value):
+        """Histogram slot for a value"""
+        index = int(value / self.bucket_width) if value > 0 else 0
+        return min(index, len(self.histogram) - 1)
+
+    def add(self, value, timestamp):
+        """Add a sample and evict everything older than the window"""
+        self.samples.append((timestamp, value))
+        self.total += value
+        self.histogram[self.bucket(value)] += 1
+
+        while self.max_candidates and self.max_candidates[-1][1] <= value:
+            self.max_candidates.pop()
+        self.max_candidates.append((timestamp, value))
+
+        self.evict(timestamp)
+
+    def evict(self, now):
+        """Drop samples that fell out of the window"""
+        cutoff = now - self.seconds
+        while self.samples and self.samples[0][0] <= cutoff:
+            _, value = self.samples.popleft()
+            self.total -= value
+            self.histogram[self.bucket(value)] -= 1
+        while self.max_candidates and self.max_candidates[0][0] <= cutoff:
+            self.max_candidates.popleft()
+
+    def count(self):
+        return len(self.samples)
+
+    def avg(self):
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def max(self):
+        return self.max_candidates[0][1] if self.max_candidates else 0.0
+
+    def percentile(self, pct):
+        """Approximate percentile (upper edge of the matching bucket)"""
+        if not self.samples:
+            return 0.0
+        rank = pct / 100 * len(self.samples)
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= rank:
+                return min((index + 1) * self.bucket_width, self.max())
+        return self.max()
+
+
+class AlertRule:
+    """Fire when a windowed aggregate crosses `threshold`
+
+    The alert clears only after the aggregate drops below `clear_threshold`
+    (hysteresis). While firing, it is reported once; `repeat_interval`
+    re-sends a reminder. After a 'firing' notification, new episodes of the
+    same rule are suppressed for `suppress` seconds and counted instead; an
+    episode that is still firing when that time is up is reported then,
+    with the suppressed count.
+    """
+
+    def __init__(self, name, metric, threshold, aggregate='avg', window=60,
+                 percentile=95, clear_threshold=None, min_samples=1,
+                 repeat_interval=None, suppress=300, max_value=100.0):
+        self.name = name
+        self.metric = metric
+        self.threshold = threshold
+        self.aggregate = aggregate
+        self.percentile = percentile
+        self.clear_threshold = threshold - 5 if clear_threshold is None else clear_threshold
+        self.min_samples = min_samples
+        self.repeat_interval = repeat_interval
+        self.suppress = suppress
+
+        self.window = SlidingWindow(window, max_value=max_value)
+        self.firing = False
+        self.episode_notified = False
+        self.last_notified = None
+        self.suppressed = 0
+
+    def value(self):
+        """Current aggregate over the window"""
+        if self.aggregate == 'max':
+            return self.window.max()
+        if self.aggregate == 'percentile':
+            return self.window.percentile(self.percentile)
+        return self.window.avg()
+
+    def label(self):
+        if self.aggregate == 'percentile':
+            return f"p{self.percentile}"
+        return self.aggregate
+
+    def evaluate(self, sample_value, timestamp):
+        """Feed one sample; return an alert dict or None"""
+        self.window.add(sample_value, timestamp)
+        if self.window.count() < self.min_samples:
+            return None
+
+        value = self.value()
+
+        if not self.firing and value > self.threshold:
+            self.firing = True
+            if self.last_notified is not None and timestamp - self.last_notified < self.suppress:
+                self.suppressed += 1
+                self.episode_notified = False
+                return None
+            self.episode_notified = True
+            return self.notify('firing', value, timestamp)
+
+        if self.firing and value < self.clear_threshold:
+            self.firing = False
+            if not self.episode_notified:
+                return None
+            return self.notify('resolved', value, timestamp)
+
+        if (self.firing and not self.episode_notified
+                and timestamp - self.last_notified >= self.suppress):
+            # Suppressed at its start and still going: report it now
+            self.episode_notified = True
+            return self.notify('firing', value, timestamp)
+
+        if (self.firing and self.episode_notified and self.repeat_interval is not None
+                and timestamp - self.last_notified >= self.repeat_interval):
+            return self.notify('firing', value, timestamp)
+
+        return None
+
+    def notify(self, state, value, timestamp):
+        """Build an alert and reset the suppression counter
+
+        Only 'firing' notifications restart the suppression window, so a
+        resolve does not extend it.
+        """
+        alert = {
+            'rule': self.name,
+            'metric': self.metric,
+            'state': state,
+            'value': round(value, 2),
+            'aggregate': self.label(),
+            'window': self.window.seconds,
+            'threshold': self.threshold,
+            'timestamp': timestamp,
+            'suppressed': self.suppressed
+        }
+        if state == 'firing':
+            self.last_notified = timestamp
+        self.suppressed = 0
+        return alert
+
+
+def format_alert(alert):
+    """One-line text for an alert"""
+    if alert['state'] == 'resolved':
+        text = (f"✅ {alert['rule']} RESOLVED: {alert['metric']} {alert['aggregate']} "
+                f"{alert['value']}% over {alert['window']}s")
+    else:
+        text = (f"⚠️  {alert['rule']}: {alert['metric']} {alert['aggregate']} "
+                f"{alert['value']}% over {alert['window']}s (Threshold: {alert['threshold']}%)")
+    if alert['suppressed']:
+        text += f" [{alert['suppressed']} suppressed]"
+    return text
+
+
+class ConsoleSink:
+    """Print alerts to the console"""
+
+    def send(self, alert):
+        timestamp = datetime.fromtimestamp(alert['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"[{timestamp}] {format_alert(alert)}")
+
+    def poll(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FileSink:
+    """Append log lines to a file in batches instead of once per line"""
+
+    def __init__(self, path, buffer_size=50, flush_interval=10):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def write(self, line):
+        """Buffer a raw log line"""
+        self.buffer.append(line)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self):
+        """Flush if the buffer has been held for `flush_interval` seconds"""
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def send(self, alert):
+        timestamp = datetime.fromtimestamp(alert['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+        self.write(f"[{timestamp}] {format_alert(alert)}\n")
+
+    def flush(self):
+        """Write all buffered lines with a single open/append"""
+        self.last_flush = time.monotonic()
+        if not self.buffer:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+
+
+class EmailSink:
+    """Send alerts as digest emails, at most one every `min_interval` seconds"""
+
+    def __init__(self, email_bot, recipients, min_interval=300, subject="System Monitor Alerts"):
+        self.email_bot = email_bot
+        self.recipients = recipients
+        self.min_interval = min_interval
+        self.subject = subject
+        self.pending = []
+        self.last_sent = None
+
+    def send(self, alert):
+        self.pending.append(alert)
+        self.poll()
+
+    def poll(self):
+        """Send the digest once `min_interval` has passed since the last one"""
+        if self.last_sent is None or time.monotonic() - self.last_sent >= self.min_interval:
+            self.flush()
+
+    def flush(self):
+        """Send all pending alerts in one email"""
+        if not self.pending:
+            return
+        lines = []
+        for alert in self.pending:
+            timestamp = datetime.fromtimestamp(alert['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+            lines.append(f"[{timestamp}] {format_alert(alert)}")
+        subject = f"{self.subject} ({len(self.pending)})"
+        self.email_bot.send_email(self.recipients, subject, '\n'.join(lines))
+        self.pending = []
+        self.last_sent = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+
+class AlertEngine:
+    """Evaluate rules against each sample and fan alerts out to sinks"""
+
+    def __init__(self, rules=None, sinks=None):
+        self.rules = list(rules or [])
+        self.sinks = list(sinks or [])
+
+    def add_rule(self, rule):
+        self.rules.append(rule)
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def process(self, metrics, timestamp=None):
+        """Feed a {metric: value} dict; return the alerts that were emitted"""
+        timestamp = time.time() if timestamp is None else timestamp
+        alerts = []
+
+        for rule in self.rules:
+            if rule.metric not in metrics:
+                continue
+            alert = rule.evaluate(metrics[rule.metric], timestamp)
+            if alert:
+                alerts.append(alert)
+
+        for sink in self.sinks:
+            try:
+                for alert in alerts:
+                    sink.send(alert)
+                sink.poll()
+            except Exception as e:
+                print(f"❌ Alert sink error: {e}")
+
+        return alerts
+
+    def active(self):
+        """Names of rules currently firing"""
+        return [rule.name for rule in self.rules if rule.firing]
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                print(f"❌ Alert sink error: {e}")
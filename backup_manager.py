@@ -4,10 +4,12 @@ Create and manage backups with compression
 """
 
 import shutil
+import uuid
 from pathlib import Path
 from datetime import datetime, timedelta
 import zipfile
 import tarfile
+from instrumentation import Progress, span
 
 class BackupManager:
     def __init__(self, source_dir, backup_dir, compression_type, retention_days):
@@ -19,19 +21,23 @@ class BackupManager:
         self.backup_dir.mkdir(parents=True, exist_ok=True)
 
     def get_backup_name(self):
-        """Generate backup name"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return f"backup_{timestamp}"
+        """Generate a unique backup name
+
+        Microseconds plus a random suffix, so backups started in the same
+        second (parallel batch tasks) never write to the same archive.
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        return f"backup_{timestamp}_{uuid.uuid4().hex[:6]}"
 
     def create_zip_backup(self, backup_path):
         """Create ZIP backup"""
         print("📦 Creating ZIP backup...")
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf, Progress('Added') as progress:
             for file_path in self.source_dir.rglob('*'):
                 if file_path.is_file():
                     arcname = file_path.relative_to(self.source_dir.parent)
                     zipf.write(file_path, arcname)
-                    print(f"  ✓ Added: {file_path.name}")
+                    progress.update(1, file_path.stat().st_size)
 
         print(f"\n✅ Backup created: {backup_path}")
         print(f"📊 Size: {backup_path.stat().st_size / (1024**2):.2f} MB")
@@ -39,8 +45,12 @@ class BackupManager:
     def create_tar_backup(self, backup_path):
         """Create TAR.GZ backup"""
         print("📦 Creating TAR.GZ backup...")
-        with tarfile.open(backup_path, 'w:gz') as tar:
-            tar.add(self.source_dir, arcname=self.source_dir.name)
+        with tarfile.open(backup_path, 'w:gz') as tar, Progress('Added') as progress:
+            def track(member):
+                if member.isfile():
+                    progress.update(1, member.size)
+                return member
+            tar.add(self.source_dir, arcname=self.source_dir.name, filter=track)
 
         print(f"\n✅ Backup created: {backup_path}")
         print(f"📊 Size: {backup_path.stat().st_size / (1024**2):.2f} MB")
@@ -48,7 +58,12 @@ class BackupManager:
     def create_uncompressed_backup(self, backup_path):
         """Create uncompressed backup"""
         print("📦 Creating uncompressed backup...")
-        shutil.copytree(self.source_dir, backup_path)
+        with Progress('Copied') as progress:
+            def copy(src, dst):
+                result = shutil.copy2(src, dst)
+                progress.update(1, Path(src).stat().st_size)
+                return result
+            shutil.copytree(self.source_dir, backup_path, copy_function=copy)
 
         file_count = sum(1 for _ in backup_path.rglob('*') if _.is_file())
         print(f"\n✅ Backup created: {backup_path}")
@@ -58,15 +73,16 @@ class BackupManager:
         """Create full backup"""
         backup_name = self.get_backup_name()
 
-        if self.compression_type == 'zip':
-            backup_path = self.backup_dir / f"{backup_name}.zip"
-            self.create_zip_backup(backup_path)
-        elif self.compression_type == 'tar':
-            backup_path = self.backup_dir / f"{backup_name}.tar.gz"
-            self.create_tar_backup(backup_path)
-        else:
-            backup_path = self.backup_dir / backup_name
-            self.create_uncompressed_backup(backup_path)
+        with span('backup.create', compression=self.compression_type, source=str(self.source_dir)):
+            if self.compression_type == 'zip':
+                backup_path = self.backup_dir / f"{backup_name}.zip"
+                self.create_zip_backup(backup_path)
+            elif self.compression_type == 'tar':
+                backup_path = self.backup_dir / f"{backup_name}.tar.gz"
+                self.create_tar_backup(backup_path)
+            else:
+                backup_path = self.backup_dir / backup_name
+                self.create_uncompressed_backup(backup_path)
 
         return backup_path
 
@@ -101,15 +117,17 @@ class BackupManager:
             print(f"❌ Source directory not found!")
             return
 
+        backup_path = None
         if backup_type == 'full' or backup_type == 'mirror':
-            self.create_full_backup()
+            backup_path = self.create_full_backup()
         elif backup_type == 'incremental':
             # Simplified incremental
             backups = list(self.backup_dir.glob('backup_*'))
             if not backups:
                 print("ℹ️  No previous backup found. Creating full backup...")
-                self.create_full_backup()
+                backup_path = self.create_full_backup()
             else:
-                self.create_full_backup()
+                backup_path = self.create_full_backup()
 
         self.clean_old_backups()
+        return backup_path
@@ -0,0 +1,579 @@
+"""
+Benchmark Suite
+Reproducible throughput, latency and memory benchmarks for every module
+
+    python benchmark_suite.py                          # run, save benchmark_results.json
+    python benchmark_suite.py --baseline base.json     # compare, exit 1 on regression
+    python benchmark_suite.py --only backup,organize --scale 0.2
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+EXTENSIONS = ['.jpg', '.png', '.pdf', '.docx', '.txt', '.csv', '.mp3', '.mp4', '.zip', '.py', '.json', '.bin']
+FIXED_MTIME = datetime(2025, 1, 15, 12, 0).timestamp()
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def make_file_tree(root, files=1000, dirs=10, depth=2, min_size=256, max_size=64 * 1024, seed=42):
+    """Create a deterministic tree; returns (file_count, total_bytes)
+
+    Files are spread over `dirs` directories per level, `depth` levels deep
+    (depth 0 puts everything directly in `root`). Content, sizes and mtimes
+    only depend on the arguments.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    folders = [root]
+    level = [root]
+    for _ in range(depth):
+        level = [parent / f"dir{i:03d}" for parent in level for i in range(dirs)]
+        folders.extend(level)
+    for folder in folders:
+        folder.mkdir(parents=True, exist_ok=True)
+
+    total = 0
+    block = bytes(rng.getrandbits(8) for _ in range(4096))
+    for i in range(files):
+        folder = folders[rng.randrange(len(folders))]
+        size = rng.randint(min_size, max_size)
+        path = folder / f"file{i:06d}{rng.choice(EXTENSIONS)}"
+        with open(path, 'wb') as f:
+            f.write((block * (size // len(block) + 1))[:size])
+        mtime = FIXED_MTIME - rng.randrange(0, 90) * 86400
+        os.utime(path, (mtime, mtime))
+        total += size
+    return files, total
+
+
+def make_html_pages(root, pages=50, links=100, rows=50, seed=42):
+    """Write deterministic HTML pages with headings, links, images and a table"""
+    rng = random.Random(seed)
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    for page in range(pages):
+        parts = [f"<html><head><title>Page {page}</title></head><body>"]
+        for level in range(1, 7):
+            parts.append(f"<h{level}>Heading {page}.{level}</h{level}>")
+        for i in range(links):
+            target = rng.randrange(pages)
+            parts.append(f'<p>Paragraph {i} <a href="/page{target:04d}.html">link {i}</a> '
+                         f'<img src="/img/{i}.png" alt="image {i}"></p>')
+        parts.append("<table>")
+        for r in range(rows):
+            parts.append("<tr>" + "".join(f"<td>{rng.randint(0, 9999)}</td>" for _ in range(5)) + "</tr>")
+        parts.append("</table></body></html>")
+        (root / f"page{page:04d}.html").write_text("\n".join(parts), encoding='utf-8')
+    return pages
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve_directory(directory):
+    """Serve a directory over HTTP on a free local port; yields the base URL"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=str(directory)))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough ESMTP (EHLO, AUTH PLAIN, MAIL, RCPT, DATA, QUIT) to accept mail"""
+
+    def reply(self, line):
+        self.wfile.write((line + '\r\n').encode('ascii'))
+
+    def handle(self):
+        self.reply('220 stub ESMTP ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.wfile.write(b'250-stub\r\n250-AUTH PLAIN LOGIN\r\n250 OK\r\n')
+            elif command.startswith('AUTH'):
+                self.reply('235 Authentication successful')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data in (b'.\r\n', b'.\n'):
+                        break
+                with self.server.lock:
+                    self.server.messages += 1
+                self.reply('250 OK queued')
+            elif command.startswith('QUIT'):
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+@contextlib.contextmanager
+def stub_smtp_server():
+    """Run the stub SMTP server on a free local port; yields (host, port, server)"""
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), StubSMTPHandler)
+    server.daemon_threads = True
+    server.messages = 0
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield '127.0.0.1', server.server_address[1], server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def percentile(sorted_values, pct):
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def measure(run, setup=None, repeat=5, items=1, nbytes=0):
+    """Time `run(state)` `repeat` times, plus one tracemalloc pass for peak memory
+
+    `setup()` builds fresh state before every run and is not timed.
+    Module output is discarded so console speed does not skew results.
+    """
+    latencies = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            state = setup() if setup else None
+            start = time.perf_counter()
+            run(state)
+            latencies.append(time.perf_counter() - start)
+
+        state = setup() if setup else None
+        tracemalloc.start()
+        try:
+            run(state)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    latencies.sort()
+    p50 = percentile(latencies, 50)
+    result = {
+        'repeat': repeat,
+        'p50_ms': p50 * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'max_ms': latencies[-1] * 1000,
+        'items_per_s': items / p50 if p50 else 0.0,
+        'peak_memory_mb': peak / (1024**2)
+    }
+    if nbytes:
+        result['mb_per_s'] = nbytes / (1024**2) / p50 if p50 else 0.0
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_backup(work, config):
+    from backup_manager import BackupManager
+
+    source = work / 'backup_src' / 'data'
+    files, total = make_file_tree(source, files=config['files'], dirs=8, depth=2)
+    results = {}
+    for compression in ('zip', 'tar', 'none'):
+        dest = work / f'backup_dst_{compression}'
+
+        def run(_):
+            BackupManager(source, dest, compression, 0).create_full_backup()
+
+        def setup():
+            # Every run writes into an empty destination, so results do not depend on
+            # how many archives earlier runs left behind (and disk use stays bounded)
+            shutil.rmtree(dest, ignore_errors=True)
+
+        results[compression] = measure(run, setup, config['repeat'], files, total)
+    return results
+
+
+def bench_organize(work, config):
+    from file_organizer import FileOrganizer
+
+    results = {}
+    for mode in ('extension', 'date', 'size'):
+        counter = {'n': 0}
+
+        def setup():
+            counter['n'] += 1
+            base = work / f'organize_{mode}_{counter["n"]}'
+            make_file_tree(base / 'src', files=config['files'], depth=0, max_size=4096)
+            return FileOrganizer(base / 'src', base / 'dst')
+
+        def run(organizer):
+            getattr(organizer, f'organize_by_{mode}')()
+
+        results[mode] = measure(run, setup, config['repeat'], config['files'])
+    return results
+
+
+def bench_scraper(work, config):
+    from web_scraper import WebScraper
+
+    pages = make_html_pages(work / 'site', pages=config['pages'])
+    results = {}
+    with serve_directory(work / 'site') as base_url:
+        urls = [f"{base_url}/page{i:04d}.html" for i in range(pages)]
+
+        def fetch_all(_):
+            for url in urls:
+                WebScraper(url).fetch_page()
+
+        def scrape_all(_):
+            for url in urls:
+                scraper = WebScraper(url)
+                scraper.fetch_page()
+                scraper.scrape_links()
+                scraper.scrape_tables()
+
+        results['fetch_parse'] = measure(fetch_all, None, config['repeat'], pages)
+        results['fetch_extract'] = measure(scrape_all, None, config['repeat'], pages)
+    return results
+
+
+def bench_email(work, config):
+    from email_sender import EmailAutomation
+
+    attachment = work / 'attachment.bin'
+    attachment.write_bytes(bytes(random.Random(7).getrandbits(8) for _ in range(64 * 1024)))
+    emails = config['emails']
+    results = {}
+    with stub_smtp_server() as (host, port, server):
+        bot = EmailAutomation(host, port, 'bench@example.com', 'secret', use_tls=False)
+
+        def send_plain(_):
+            for i in range(emails):
+                bot.send_email(['a@example.com', 'b@example.com'], f"Bench {i}", "Hello\n" * 50)
+
+        def send_attachment(_):
+            for i in range(emails):
+                bot.send_email(['a@example.com'], f"Bench {i}", "See attached", [str(attachment)])
+
+        results['plain'] = measure(send_plain, None, config['repeat'], emails)
+        results['attachment'] = measure(send_attachment, None, config['repeat'], emails,
+                                        emails * attachment.stat().st_size)
+        results['delivered'] = server.messages
+    return results
+
+
+def bench_monitor(work, config):
+    from system_monitor import SystemMonitor
+
+    monitor = SystemMonitor(80, 85, 'console', 1)
+    # get_cpu_usage() sleeps for 1s by design, so time the other collectors
+    monitor.get_top_processes()
+
+    def sample(_):
+        for _ in range(config['samples']):
+            monitor.get_ram_usage()
+            monitor.get_disk_usage()
+            monitor.get_disk_io_rates()
+            monitor.get_network_rates()
+            monitor.get_top_processes()
+
+    result = measure(sample, None, config['repeat'], config['samples'])
+    result['processes'] = monitor.process_tracker.sample()['count']
+    return {'sample': result}
+
+
+def bench_scheduler(work, config):
+    from task_scheduler import Job, JobExecutor
+    from scheduler_core import benchmark_scheduler
+
+    runs = config['dispatch']
+    job = Job('noop', func=lambda: None, max_instances=runs)
+    delays = []
+
+    def setup():
+        executor = JobExecutor(max_workers=4, log_dir=work / 'task_logs')
+        executor.add_listener(lambda result: delays.append(result['started_at'] - result['scheduled_at']))
+        return executor
+
+    def run(executor):
+        futures = [executor.submit(job) for _ in range(runs)]
+        for future in futures:
+            future.result()
+        executor.shutdown()
+
+    results = {'dispatch': measure(run, setup, config['repeat'], runs)}
+    delays.sort()
+    results['dispatch']['start_delay_p50_ms'] = percentile(delays, 50) * 1000
+    results['dispatch']['start_delay_p95_ms'] = percentile(delays, 95) * 1000
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        core = benchmark_scheduler(job_count=config['heap_jobs'], duration=config['heap_seconds'])
+    results['heap_core'] = {
+        'add_us_per_job': core['add_us_per_job'],
+        'wakeups': core['wakeups'],
+        'fired': core['fired'],
+        'jitter_p50_ms': core['jitter_p50_ms'],
+        'jitter_p99_ms': core['jitter_p99_ms']
+    }
+    return results
+
+
+BENCHMARKS = {
+    'backup': bench_backup,
+    'organize': bench_organize,
+    'scraper': bench_scraper,
+    'email': bench_email,
+    'monitor': bench_monitor,
+    'scheduler': bench_scheduler
+}
+
+
+def make_config(scale=1.0, repeat=5):
+    def scaled(value):
+        return max(int(value * scale), 1)
+    return {
+        'repeat': repeat,
+        'files': scaled(2000),
+        'pages': scaled(50),
+        'emails': scaled(50),
+        'samples': scaled(20),
+        'dispatch': scaled(500),
+        'heap_jobs': scaled(20000),
+        'heap_seconds': 2.0
+    }
+
+
+def run_suite(only=None, scale=1.0, repeat=5):
+    """Run the selected benchmarks in a scratch directory; returns the results dict"""
+    config = make_config(scale, repeat)
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'benchmarks': {},
+        'skipped': {}
+    }
+
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='automation_bench_') as scratch:
+        work = Path(scratch)
+        # WebScraper.save_data writes into the working directory
+        os.chdir(work)
+        try:
+            for name, bench in BENCHMARKS.items():
+                if only and name not in only:
+                    continue
+                print(f"⏱️  {name}...", flush=True)
+                try:
+                    results['benchmarks'][name] = bench(work, config)
+                except ImportError as e:
+                    results['skipped'][name] = f"missing dependency: {e.name}"
+                    print(f"  ⏭️  skipped ({results['skipped'][name]})")
+        finally:
+            os.chdir(original_cwd)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def flatten(results, prefix=''):
+    """{'backup': {'zip': {'p50_ms': 1}}} -> {'backup.zip.p50_ms': 1}"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def higher_is_better(metric):
+    return metric.endswith('_per_s')
+
+
+def gated(metric):
+    """Metrics stable enough to fail the run: median latency, throughput, peak memory"""
+    return metric.endswith(('.p50_ms', '_per_s', '_mb'))
+
+
+def tracked(metric):
+    """Everything worth showing in a comparison; tails and jitter are report-only"""
+    return metric.endswith(('_per_s', '_ms', '_mb', 'us_per_job'))
+
+
+def above_noise_floor(metric, before, now, min_delta_ms, min_delta_mb):
+    """True if the absolute change is big enough to be more than timer noise
+
+    Throughput is items / p50, so it uses the same floor on its sibling p50.
+    """
+    if metric.endswith('_mb'):
+        return abs(now[metric] - before[metric]) >= min_delta_mb
+    if metric.endswith('_per_s'):
+        metric = metric.rsplit('.', 1)[0] + '.p50_ms'
+    if metric.endswith('_ms') and metric in before and metric in now:
+        return abs(now[metric] - before[metric]) >= min_delta_ms
+    return True
+
+
+def compare(current, baseline, threshold=0.10, memory_threshold=0.25, min_delta_ms=1.0, min_delta_mb=0.5):
+    """Return (regressions, improvements, report_only) as lists of dicts
+
+    Only gated metrics whose change beats both the relative threshold and
+    the absolute noise floor count as regressions or improvements. Changes
+    in p95/max latency, jitter and the like are returned as report_only.
+    """
+    now = flatten(current['benchmarks'])
+    before = flatten(baseline['benchmarks'])
+    regressions = []
+    improvements = []
+    report_only = []
+
+    for metric, old in sorted(before.items()):
+        if metric not in now or not tracked(metric) or old == 0:
+            continue
+        new = now[metric]
+        change = (new - old) / old
+        worse = -change if higher_is_better(metric) else change
+        limit = memory_threshold if metric.endswith('_mb') else threshold
+        if abs(worse) <= limit:
+            continue
+        entry = {'metric': metric, 'baseline': old, 'current': new, 'change_pct': change * 100}
+        if not gated(metric):
+            report_only.append(entry)
+        elif not above_noise_floor(metric, before, now, min_delta_ms, min_delta_mb):
+            continue
+        elif worse > 0:
+            regressions.append(entry)
+        else:
+            improvements.append(entry)
+    return regressions, improvements, report_only
+
+
+def merge_best(results, rerun):
+    """Keep the better value of every gated metric across two runs"""
+    def merge(old, new, path):
+        for key, value in new.items():
+            name = f"{path}.{key}"
+            if isinstance(value, dict) and isinstance(old.get(key), dict):
+                merge(old[key], value, name)
+            elif key in old and gated(name) and isinstance(value, (int, float)):
+                better = max if higher_is_better(name) else min
+                old[key] = better(old[key], value)
+
+    for name, group in rerun['benchmarks'].items():
+        if name in results['benchmarks']:
+            merge(results['benchmarks'][name], group, name)
+
+
+def print_results(results):
+    print("\n📊 BENCHMARK RESULTS\n")
+    for metric, value in flatten(results['benchmarks']).items():
+        print(f"  {metric:<48} {value:>14,.3f}")
+    for name, reason in results['skipped'].items():
+        print(f"  {name:<48} skipped: {reason}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the automation modules")
+    parser.add_argument('--only', help="comma-separated: " + ', '.join(BENCHMARKS))
+    parser.add_argument('--scale', type=float, default=1.0, help="fixture size multiplier (default: 1.0)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per benchmark (default: 5)")
+    parser.add_argument('--output', default='benchmark_results.json', help="where to save results")
+    parser.add_argument('--baseline', help="results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed slowdown as a fraction (default: 0.10)")
+    parser.add_argument('--memory-threshold', type=float, default=0.25,
+                        help="allowed peak memory growth as a fraction (default: 0.25)")
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help="ignore p50 changes smaller than this (default: 1.0)")
+    parser.add_argument('--min-delta-mb', type=float, default=0.5,
+                        help="ignore peak memory changes smaller than this (default: 0.5)")
+    parser.add_argument('--confirm', type=int, default=2,
+                        help="re-runs of regressed benchmarks before failing (default: 2)")
+    args = parser.parse_args(argv)
+
+    only = set(args.only.split(',')) if args.only else None
+    if only and only - set(BENCHMARKS):
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(only - set(BENCHMARKS)))}")
+
+    output = Path(args.output).resolve()
+    baseline_path = Path(args.baseline).resolve() if args.baseline else None
+
+    results = run_suite(only, args.scale, args.repeat)
+    print_results(results)
+
+    regressions = []
+    if baseline_path is not None:
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+        if baseline.get('config') != results['config']:
+            print("⚠️  Baseline was recorded with a different config; comparison may be misleading")
+
+        def check():
+            return compare(results, baseline, args.threshold, args.memory_threshold,
+                           args.min_delta_ms, args.min_delta_mb)
+
+        regressions, improvements, report_only = check()
+        # A one-off slow run should not fail the gate: re-run what regressed, keep the best
+        for _ in range(args.confirm):
+            if not regressions:
+                break
+            groups = sorted({entry['metric'].split('.')[0] for entry in regressions})
+            print(f"\n🔁 Re-running {', '.join(groups)} to confirm {len(regressions)} regression(s)...")
+            merge_best(results, run_suite(set(groups), args.scale, args.repeat))
+            regressions, improvements, report_only = check()
+
+    output.write_text(json.dumps(results, indent=2), encoding='utf-8')
+    print(f"\n💾 Results saved to: {output}")
+
+    if baseline_path is None:
+        return 0
+
+    for icon, entries in (('ℹ️ ', report_only), ('🟢', improvements), ('🔴', regressions)):
+        for entry in entries:
+            print(f"  {icon} {entry['metric']}: {entry['baseline']:,.3f} → {entry['current']:,.3f} "
+                  f"({entry['change_pct']:+.1f}%)")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond threshold")
+        return 1
+    print("\n✅ No regressions beyond threshold")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,13 +9,15 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from pathlib import Path
+from instrumentation import span, count
 
 class EmailAutomation:
-    def __init__(self, smtp_server, smtp_port, sender_email, sender_password):
+    def __init__(self, smtp_server, smtp_port, sender_email, sender_password, use_tls=True):
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.sender_email = sender_email
         self.sender_password = sender_password
+        self.use_tls = use_tls
 
     def send_email(self, recipient_emails, subject, body, attachments=None):
         """Send email with optional attachments"""
@@ -41,10 +43,13 @@ class EmailAutomation:
                             message.attach(part)
                         print(f"✓ Attached: {Path(file_path).name}")
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(message)
+            with span('email.send', server=self.smtp_server, recipients=len(recipient_emails)):
+                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+                    if self.use_tls:
+                        server.starttls()
+                    server.login(self.sender_email, self.sender_password)
+                    server.send_message(message)
+            count('emails')
 
             print(f"\n✅ Email sent to {len(recipient_emails)} recipient(s)!")
             return True
@@ -7,6 +7,7 @@ import os
 import shutil
 from pathlib import Path
 from datetime import datetime
+from instrumentation import Progress, span
 
 class FileOrganizer:
     def __init__(self, source_dir, dest_dir):
@@ -46,19 +47,21 @@ class FileOrganizer:
         self.create_directories()
         files_moved = 0
 
-        for file_path in self.source_dir.iterdir():
-            if file_path.is_file():
-                category = self.get_category(file_path.suffix)
-                dest_folder = self.dest_dir / category
+        with span('organize.extension', source=str(self.source_dir)), Progress('Moved') as progress:
+            for file_path in self.source_dir.iterdir():
+                if file_path.is_file():
+                    category = self.get_category(file_path.suffix)
+                    dest_folder = self.dest_dir / category
 
-                try:
-                    shutil.move(str(file_path), str(dest_folder / file_path.name))
-                    print(f"✓ Moved: {file_path.name} → {category}")
-                    files_moved += 1
-                except Exception as e:
-                    print(f"❌ Error moving {file_path.name}: {e}")
+                    try:
+                        shutil.move(str(file_path), str(dest_folder / file_path.name))
+                        progress.update()
+                        files_moved += 1
+                    except Exception as e:
+                        print(f"❌ Error moving {file_path.name}: {e}")
 
         print(f"\n✅ Organized {files_moved} files!")
+        return files_moved
 
     def organize_by_date(self):
         """Organize files by date"""
@@ -67,21 +70,23 @@ class FileOrganizer:
             return
 
         files_moved = 0
-        for file_path in self.source_dir.iterdir():
-            if file_path.is_file():
-                mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                date_folder = mod_time.strftime('%Y-%m-%d')
-                dest_folder = self.dest_dir / date_folder
-                dest_folder.mkdir(parents=True, exist_ok=True)
-
-                try:
-                    shutil.move(str(file_path), str(dest_folder / file_path.name))
-                    print(f"✓ Moved: {file_path.name} → {date_folder}")
-                    files_moved += 1
-                except Exception as e:
-                    print(f"❌ Error: {e}")
+        with span('organize.date', source=str(self.source_dir)), Progress('Moved') as progress:
+            for file_path in self.source_dir.iterdir():
+                if file_path.is_file():
+                    mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
+                    date_folder = mod_time.strftime('%Y-%m-%d')
+                    dest_folder = self.dest_dir / date_folder
+                    dest_folder.mkdir(parents=True, exist_ok=True)
+
+                    try:
+                        shutil.move(str(file_path), str(dest_folder / file_path.name))
+                        progress.update()
+                        files_moved += 1
+                    except Exception as e:
+                        print(f"❌ Error: {e}")
 
         print(f"\n✅ Organized {files_moved} files by date!")
+        return files_moved
 
     def organize_by_size(self):
         """Organize files by size"""
@@ -100,20 +105,21 @@ class FileOrganizer:
             (self.dest_dir / category).mkdir(parents=True, exist_ok=True)
 
         files_moved = 0
-        for file_path in self.source_dir.iterdir():
-            if file_path.is_file():
-                file_size = file_path.stat().st_size
-
-                for category, max_size in size_categories.items():
-                    if file_size < max_size:
-                        dest_folder = self.dest_dir / category
-                        try:
-                            shutil.move(str(file_path), str(dest_folder / file_path.name))
-                            size_mb = file_size / (1024 * 1024)
-                            print(f"✓ Moved: {file_path.name} ({size_mb:.2f}MB) → {category}")
-                            files_moved += 1
-                        except Exception as e:
-                            print(f"❌ Error: {e}")
-                        break
+        with span('organize.size', source=str(self.source_dir)), Progress('Moved') as progress:
+            for file_path in self.source_dir.iterdir():
+                if file_path.is_file():
+                    file_size = file_path.stat().st_size
+
+                    for category, max_size in size_categories.items():
+                        if file_size < max_size:
+                            dest_folder = self.dest_dir / category
+                            try:
+                                shutil.move(str(file_path), str(dest_folder / file_path.name))
+                                progress.update(1, file_size)
+                                files_moved += 1
+                            except Exception as e:
+                                print(f"❌ Error: {e}")
+                            break
 
         print(f"\n✅ Organized {files_moved} files by size!")
+        return files_moved
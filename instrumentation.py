@@ -0,0 +1,222 @@
+"""
+Instrumentation Module
+Timing spans, counters, JSON-lines events, profiling and progress reporting
+"""
+
+import cProfile
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from pathlib import Path
+
+NULL_SPAN = nullcontext()
+
+
+class Span:
+    """Times a block and emits a 'span' event when it exits"""
+
+    __slots__ = ('owner', 'name', 'fields', 'start')
+
+    def __init__(self, owner, name, fields):
+        self.owner = owner
+        self.name = name
+        self.fields = fields
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        self.owner.emit('span', name=self.name, duration=round(duration, 6),
+                        status='error' if exc_type else 'ok', **self.fields)
+        return False
+
+
+class Instrumentation:
+    """Process-wide switchboard for spans, counters and events
+
+    Disabled by default: span() then returns a shared null context and
+    count()/emit() return immediately, so hooks in hot paths cost a single
+    attribute check.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.events_file = None
+        self.profile_dir = None
+        self.trace_memory = False
+        self.started = time.perf_counter()
+
+    def configure(self, events_path=None, profile_dir=None, trace_memory=False):
+        """Turn instrumentation on; events go to a JSON-lines file if given"""
+        self.enabled = True
+        self.started = time.perf_counter()
+        if events_path:
+            self.events_file = open(events_path, 'a', encoding='utf-8', buffering=1)
+        if profile_dir:
+            self.profile_dir = Path(profile_dir)
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if trace_memory:
+            self.trace_memory = True
+            tracemalloc.start()
+
+    def span(self, name, **fields):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, fields)
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def emit(self, event, **fields):
+        """Write one structured event as a JSON line"""
+        if not self.enabled or self.events_file is None:
+            return
+        record = {'ts': round(time.time(), 6), 'event': event, 'thread': threading.current_thread().name}
+        record.update(fields)
+        line = json.dumps(record, default=str) + '\n'
+        with self.lock:
+            self.events_file.write(line)
+
+    def task(self, name):
+        """Span for a whole task, plus cProfile/tracemalloc capture if configured"""
+        if not self.enabled:
+            return NULL_SPAN
+        return TaskCapture(self, name)
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        with self.lock:
+            counters = dict(self.counters)
+        return {'elapsed': elapsed,
+                'counters': counters,
+                'rates': {name: value / elapsed for name, value in counters.items()} if elapsed else {}}
+
+    def close(self):
+        """Emit and print the counter summary, then release resources"""
+        if not self.enabled:
+            return
+        summary = self.summary()
+        self.emit('summary', **summary)
+        if summary['counters']:
+            print("\n📈 Instrumentation summary")
+            for name, value in sorted(summary['counters'].items()):
+                print(f"  {name:<20} {value:>12,}  ({summary['rates'][name]:,.1f}/s)")
+        if self.events_file:
+            self.events_file.close()
+            self.events_file = None
+        if self.trace_memory:
+            tracemalloc.stop()
+            self.trace_memory = False
+        self.enabled = False
+
+
+class TaskCapture:
+    """Task-level span with optional cProfile dump and tracemalloc peak
+
+    tracemalloc is process-wide, so with tasks running in parallel the
+    reported peak covers everything running at the same time.
+    """
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        self.span = Span(owner, 'task', {'task': name})
+        self.profiler = None
+
+    def __enter__(self):
+        if self.owner.profile_dir is not None:
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:
+                # Another profiler is already active in this process
+                self.profiler = None
+        if self.owner.trace_memory:
+            tracemalloc.reset_peak()
+        self.span.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.owner.trace_memory:
+            self.span.fields['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        if self.profiler is not None:
+            self.profiler.disable()
+            safe_name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in self.name)
+            path = self.owner.profile_dir / f"{safe_name}_{int(time.time())}.prof"
+            self.profiler.dump_stats(str(path))
+            self.span.fields['profile'] = str(path)
+        return self.span.__exit__(exc_type, exc, tb)
+
+
+instrumentation = Instrumentation()
+span = instrumentation.span
+count = instrumentation.count
+emit = instrumentation.emit
+
+
+class Progress:
+    """Rate-limited progress line instead of one print per item
+
+    Prints at most once every `interval` seconds while running and a
+    throughput line on close. Totals also go to the shared counters
+    (`<unit>` and `bytes`).
+    """
+
+    def __init__(self, label, unit='files', total=None, interval=1.0, stream=None):
+        self.label = label
+        self.unit = unit
+        self.total = total
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.count = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+        self.last_print = self.started
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def update(self, items=1, nbytes=0):
+        self.count += items
+        self.bytes += nbytes
+        now = time.monotonic()
+        if now - self.last_print >= self.interval:
+            self.last_print = now
+            self.write(f"  ⏳ {self.label}: {self.status(now)}")
+
+    def status(self, now):
+        elapsed = max(now - self.started, 1e-9)
+        done = f"{self.count}/{self.total}" if self.total else f"{self.count}"
+        text = f"{done} {self.unit} ({self.count / elapsed:,.1f} {self.unit}/s"
+        if self.bytes:
+            text += f", {self.bytes / elapsed / (1024**2):,.2f} MB/s"
+        return text + ")"
+
+    def write(self, line):
+        print(line, file=self.stream, flush=True)
+
+    def close(self):
+        now = time.monotonic()
+        elapsed = now - self.started
+        if self.count:
+            self.write(f"  ⚡ {self.label}: {self.status(now)} in {elapsed:.2f}s")
+        count(self.unit, self.count)
+        if self.bytes:
+            count('bytes', self.bytes)
+        emit('progress', label=self.label, unit=self.unit, count=self.count,
+             bytes=self.bytes, duration=round(elapsed, 6))
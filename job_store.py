@@ -0,0 +1,210 @@
+"""
+Job Store Module
+Persist scheduled jobs, next fire times and run history in SQLite
+"""
+
+import json
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    script_path TEXT NOT NULL,
+    args TEXT NOT NULL,
+    timeout REAL,
+    max_instances INTEGER NOT NULL,
+    catchup TEXT,
+    trigger TEXT NOT NULL,
+    next_fire REAL,
+    mode TEXT NOT NULL DEFAULT 'subprocess'
+);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    job TEXT NOT NULL,
+    run INTEGER,
+    status TEXT NOT NULL,
+    exit_code INTEGER,
+    scheduled_at REAL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    duration REAL,
+    log TEXT
+);
+
+CREATE INDEX IF NOT EXISTS runs_job_started ON runs (job, started_at);
+CREATE INDEX IF NOT EXISTS runs_started ON runs (started_at);
+CREATE INDEX IF NOT EXISTS runs_status_started ON runs (status, started_at);
+CREATE INDEX IF NOT EXISTS runs_run ON runs (run);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+CATCHUP_POLICIES = ('once', 'all', 'skip')
+
+
+class JobStore:
+    """SQLite (WAL) store for job definitions, next fire times and run history
+
+    WAL with synchronous=NORMAL keeps the database consistent across crashes
+    while each write stays a cheap append. One connection is shared between
+    the scheduler thread and the worker threads behind a lock.
+    """
+
+    def __init__(self, path='task_scheduler.db'):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.migrate()
+        self.conn.commit()
+
+    def migrate(self):
+        """Add columns introduced after a database was created"""
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if 'mode' not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN mode TEXT NOT NULL DEFAULT 'subprocess'")
+
+    def save_job(self, job, trigger, next_fire):
+        """Insert or update a job definition"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO jobs (name, script_path, args, timeout, max_instances,"
+                " catchup, trigger, next_fire, mode) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.name, str(job.script_path), json.dumps(job.args), job.timeout,
+                 job.max_instances, job.catchup, json.dumps(trigger.to_spec()), next_fire, job.mode)
+            )
+
+    def delete_job(self, name):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM jobs WHERE name = ?", (name,))
+
+    def load_jobs(self):
+        """Return all stored job rows as dicts (args/trigger decoded)"""
+        with self.lock:
+            rows = self.conn.execute("SELECT * FROM jobs ORDER BY name").fetchall()
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job['args'] = json.loads(job['args'])
+            job['trigger'] = json.loads(job['trigger'])
+            jobs.append(job)
+        return jobs
+
+    def mark_dispatched(self, name, next_fire, task_count):
+        """Persist the new next fire time and task counter after a dispatch"""
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE jobs SET next_fire = ? WHERE name = ?", (next_fire, name))
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('task_count', ?)",
+                              (str(task_count),))
+
+    def get_task_count(self):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'task_count'").fetchone()
+        return int(row['value']) if row else 0
+
+    def get_last_run_number(self):
+        """Highest run number recorded, so numbering continues after a restart"""
+        with self.lock:
+            row = self.conn.execute("SELECT MAX(run) AS run FROM runs").fetchone()
+        return row['run'] or 0
+
+    def record_run(self, result):
+        """Append one finished run (a JobExecutor result dict)"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO runs (job, run, status, exit_code, scheduled_at, started_at,"
+                " finished_at, duration, log) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (result['job'], result.get('run'), result['status'], result.get('exit_code'),
+                 result.get('scheduled_at'), result['started_at'], result.get('finished_at'),
+                 result.get('duration'), result.get('log'))
+            )
+
+    def record_missed(self, name, fire_times):
+        """Record runs that were skipped while the scheduler was down"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO runs (job, status, scheduled_at, started_at) VALUES (?, 'missed', ?, ?)",
+                [(name, fire_at, fire_at) for fire_at in fire_times]
+            )
+
+    def history(self, job=None, status=None, since=None, until=None, limit=100):
+        """Most recent runs first, served from the (job|status, started_at) indexes"""
+        clauses = []
+        params = []
+        if job is not None:
+            clauses.append("job = ?")
+            params.append(job)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("started_at < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM runs {where} ORDER BY started_at DESC LIMIT ?", params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self, job, since=None):
+        """Run count, failures and duration summary for one job"""
+        since = 0 if since is None else since
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) AS runs,"
+                " SUM(status = 'success') AS succeeded,"
+                " SUM(status IN ('failed', 'timeout')) AS failed,"
+                " AVG(duration) AS avg_duration,"
+                " MAX(duration) AS max_duration"
+                " FROM runs WHERE job = ? AND started_at >= ?",
+                (job, since)
+            ).fetchone()
+        return dict(row)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def missed_fire_times(trigger, next_fire, now, limit=1000):
+    """Fire times in [next_fire, now] that never ran: (newest `limit`, total count)
+
+    Only the most recent `limit` slots are kept, so missed[-1] is always the
+    last fire before `now`. Interval triggers jump straight to those slots;
+    other triggers are walked one fire at a time.
+    """
+    if next_fire is None or next_fire > now:
+        return [], 0
+
+    skipped = 0
+    fire_at = next_fire
+    seconds = getattr(trigger, 'seconds', None)
+    if seconds:
+        # Interval fires sit on a fixed grid: next_fire + k * seconds
+        skipped = max(int((now - next_fire) // seconds) + 1 - limit, 0)
+        if skipped:
+            fire_at = trigger.next_fire(next_fire + (skipped - 0.5) * seconds)
+
+    missed = deque(maxlen=limit)
+    walked = 0
+    while fire_at is not None and fire_at <= now:
+        missed.append(fire_at)
+        walked += 1
+        fire_at = trigger.next_fire(fire_at)
+    return list(missed), skipped + walked
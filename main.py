@@ -8,21 +8,24 @@ Date: 2025-11-19
 
 import sys
 import os
+import argparse
+import json
+import time
 from pathlib import Path
 
 # Add modules to path
 sys.path.append(str(Path(__file__).parent / 'modules'))
 
-from file_organizer import FileOrganizer
-from email_sender import EmailAutomation
-from web_scraper import WebScraper
-from system_monitor import SystemMonitor
-from backup_manager import BackupManager
-from task_scheduler import TaskScheduler
+# Tool modules (and requests, bs4, psutil behind them) are imported inside
+# the functions that use them, so --help and small tasks start fast.
+
+from instrumentation import instrumentation
+
+VERSION = "1.0.0"
 
 class TaskAutomationHub:
     def __init__(self):
-        self.version = "1.0.0"
+        self.version = VERSION
         self.tasks = {
             '1': ('File Organizer', self.run_file_organizer),
             '2': ('Email Automation', self.run_email_automation),
@@ -55,6 +58,7 @@ class TaskAutomationHub:
 
     def run_file_organizer(self):
         """File organization automation"""
+        from file_organizer import FileOrganizer
         print("\n" + "="*60)
         print("📁 FILE ORGANIZER")
         print("="*60)
@@ -81,6 +85,7 @@ class TaskAutomationHub:
 
     def run_email_automation(self):
         """Email automation"""
+        from email_sender import EmailAutomation
         print("\n" + "="*60)
         print("📧 EMAIL AUTOMATION")
         print("="*60)
@@ -126,6 +131,7 @@ class TaskAutomationHub:
 
     def run_web_scraper(self):
         """Web scraping automation"""
+        from web_scraper import WebScraper
         print("\n" + "="*60)
         print("🌐 WEB SCRAPER")
         print("="*60)
@@ -161,12 +167,15 @@ class TaskAutomationHub:
 
     def run_system_monitor(self):
         """System monitoring"""
+        from system_monitor import SystemMonitor
+        from metrics_exporter import MetricsExporter
         print("\n" + "="*60)
         print("💻 SYSTEM MONITOR")
         print("="*60)
 
         cpu_threshold = int(input("\nCPU alert threshold (%): ").strip() or "80")
         ram_threshold = int(input("RAM alert threshold (%): ").strip() or "85")
+        disk_threshold = int(input("Disk alert threshold (%): ").strip() or "90")
         interval = int(input("Monitoring interval (seconds): ").strip() or "60")
 
         print("\nAlert method:")
@@ -175,11 +184,16 @@ class TaskAutomationHub:
         alert_choice = input("Choose (1-2): ").strip()
         alert_method = 'file' if alert_choice == '2' else 'console'
 
-        monitor = SystemMonitor(cpu_threshold, ram_threshold, alert_method, interval)
+        port = input("\nMetrics endpoint port (blank to disable): ").strip()
+        exporter = MetricsExporter(port=int(port)) if port else None
+
+        monitor = SystemMonitor(cpu_threshold, ram_threshold, alert_method, interval,
+                                disk_threshold=disk_threshold, exporter=exporter)
         monitor.monitor()
 
     def run_backup_manager(self):
         """Backup management"""
+        from backup_manager import BackupManager
         print("\n" + "="*60)
         print("💾 BACKUP MANAGER")
         print("="*60)
@@ -208,6 +222,8 @@ class TaskAutomationHub:
 
     def run_task_scheduler(self):
         """Task scheduler"""
+        from task_scheduler import TaskScheduler
+        from job_store import JobStore
         print("\n" + "="*60)
         print("⏰ TASK SCHEDULER")
         print("="*60)
@@ -219,10 +235,25 @@ class TaskAutomationHub:
         print("  [2] Every X hours")
         print("  [3] Daily at specific time")
         print("  [4] Weekly on specific day")
+        print("  [5] Cron expression")
+
+        choice = input("Choose (1-5): ").strip()
 
-        choice = input("Choose (1-4): ").strip()
+        db_path = input("\nJob store file (blank = don't persist): ").strip()
+        store = None
+        catchup = 'once'
+        if db_path:
+            store = JobStore(db_path)
+            print("\nMissed runs after restart:")
+            print("  [1] Run once")
+            print("  [2] Run all")
+            print("  [3] Skip")
+            catchup = {'1': 'once', '2': 'all', '3': 'skip'}.get(input("Choose (1-3): ").strip(), 'once')
 
-        scheduler = TaskScheduler(script_path)
+        warm = input("\nUse warm worker processes for fast startup? (y/N): ").strip().lower() == 'y'
+
+        scheduler = TaskScheduler(script_path, store=store, catchup=catchup,
+                                  warm_workers=2 if warm else 0)
         scheduler.setup_schedule(choice)
 
     def exit_app(self):
@@ -253,9 +284,312 @@ class TaskAutomationHub:
             else:
                 print("\n❌ Invalid choice! Please try again.")
 
-def main():
-    app = TaskAutomationHub()
-    app.run()
+# ---------------------------------------------------------------------------
+# Headless tasks: used by the CLI subcommands and by batch files.
+# Each one raises on failure so batch mode can report it.
+# ---------------------------------------------------------------------------
+
+SCRAPE_CHOICES = {'text': '1', 'headings': '2', 'links': '3', 'images': '4', 'tables': '5', 'custom': '6'}
+
+
+def task_organize(source, destination, by='extension'):
+    """Organize files by extension, date or size"""
+    from file_organizer import FileOrganizer
+    organizer = FileOrganizer(source, destination)
+    methods = {'extension': organizer.organize_by_extension,
+               'date': organizer.organize_by_date,
+               'size': organizer.organize_by_size}
+    if by not in methods:
+        raise ValueError(f"Unknown organize mode: {by}")
+    moved = methods[by]()
+    if moved is None:
+        raise RuntimeError(f"Source directory not found: {source}")
+    return moved
+
+
+def task_backup(source, destination, type='full', compression='zip', retention=30):
+    """Create a backup and apply the retention policy"""
+    from backup_manager import BackupManager
+    backup_path = BackupManager(source, destination, compression, retention).run_backup(type)
+    if backup_path is None:
+        raise RuntimeError(f"Backup of {source} failed")
+    return str(backup_path)
+
+
+def task_scrape(url, extract='links', format='json', selector=None):
+    """Scrape a page and save the extracted data"""
+    from web_scraper import WebScraper
+    if extract not in SCRAPE_CHOICES:
+        raise ValueError(f"Unknown extract type: {extract}")
+    scraper = WebScraper(url)
+    if not scraper.fetch_page():
+        raise RuntimeError(f"Could not fetch {url}")
+    return scraper.scrape_and_save(SCRAPE_CHOICES[extract], selector, format)
+
+
+def task_email(smtp_server, sender, to, subject, body='', body_file=None, smtp_port=587,
+               password_env='SMTP_PASSWORD', attach=None):
+    """Send an email; the password comes from an environment variable"""
+    from email_sender import EmailAutomation
+    password = os.environ.get(password_env)
+    if password is None:
+        raise RuntimeError(f"Set the {password_env} environment variable with the SMTP password")
+    if body_file:
+        body = Path(body_file).read_text(encoding='utf-8')
+    recipients = [r.strip() for r in to.split(',')] if isinstance(to, str) else list(to)
+    bot = EmailAutomation(smtp_server, int(smtp_port), sender, password)
+    if not bot.send_email(recipients, subject, body, attach):
+        raise RuntimeError("Email could not be sent")
+    return len(recipients)
+
+
+def task_monitor(cpu=80, ram=85, interval=60, alert='console', port=None, top=5, disk=90):
+    """Run the system monitor until Ctrl+C"""
+    from system_monitor import SystemMonitor
+    exporter = None
+    if port:
+        from metrics_exporter import MetricsExporter
+        exporter = MetricsExporter(port=port)
+    SystemMonitor(cpu, ram, alert, interval, disk_threshold=disk, top_n=top, exporter=exporter).monitor()
+
+
+def task_schedule(script, every_seconds=None, every_minutes=None, every_hours=None, daily=None,
+                  cron=None, workers=4, timeout=300, store=None, catchup='once', warm=0):
+    """Schedule a script and run the scheduler until Ctrl+C"""
+    from task_scheduler import TaskScheduler
+    from scheduler_core import IntervalTrigger, CronTrigger
+
+    if every_seconds:
+        trigger = IntervalTrigger(every_seconds)
+    elif every_minutes:
+        trigger = IntervalTrigger(every_minutes * 60)
+    elif every_hours:
+        trigger = IntervalTrigger(every_hours * 3600)
+    elif daily:
+        hour, minute = daily.split(':')
+        trigger = CronTrigger(f"{int(minute)} {int(hour)} * * *")
+    elif cron:
+        trigger = CronTrigger(cron)
+    else:
+        raise ValueError("Give one of --every-seconds/--every-minutes/--every-hours/--daily/--cron")
+
+    job_store = None
+    if store:
+        from job_store import JobStore
+        job_store = JobStore(store)
+
+    scheduler = TaskScheduler(script, max_workers=workers, timeout=timeout, store=job_store,
+                              catchup=catchup, warm_workers=warm)
+    scheduler.add_job(scheduler.job, trigger)
+    scheduler.run_forever()
+
+
+TASKS = {
+    'organize': task_organize,
+    'backup': task_backup,
+    'scrape': task_scrape,
+    'email': task_email,
+    'monitor': task_monitor,
+    'schedule': task_schedule
+}
+
+# Long-running tasks never finish, so they cannot be part of a batch
+BATCH_TASKS = ('organize', 'backup', 'scrape', 'email')
+
+# Tasks that move files under their original names into the destination, so two
+# of them sharing a destination can collide (backup names are unique per run)
+DESTINATION_TASKS = ('organize',)
+
+
+def load_batch_file(path):
+    """Read a JSON or YAML batch file: a list of tasks, or {'tasks': [...]}"""
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+    if path.suffix.lower() in ('.yml', '.yaml'):
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError("YAML batch files need PyYAML: pip install pyyaml")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    tasks = data.get('tasks', []) if isinstance(data, dict) else data
+    for index, task in enumerate(tasks, 1):
+        if not isinstance(task, dict) or task.get('task') not in BATCH_TASKS:
+            raise ValueError(f"Task #{index}: 'task' must be one of {', '.join(BATCH_TASKS)}")
+    return tasks
+
+
+def check_destinations(tasks):
+    """Reject tasks that would write into the same destination at the same time"""
+    seen = {}
+    for index, spec in enumerate(tasks, 1):
+        if spec['task'] not in DESTINATION_TASKS or 'destination' not in spec:
+            continue
+        destination = Path(spec['destination']).expanduser().resolve()
+        name = spec.get('name', f"{spec['task']}#{index}")
+        if destination in seen:
+            raise ValueError(f"Tasks '{seen[destination]}' and '{name}' both write to {destination}; "
+                             f"use separate destinations or --parallel 1")
+        seen[destination] = name
+
+
+def run_task_spec(index, spec):
+    """Run one batch entry and return its outcome"""
+    options = {key.replace('-', '_'): value for key, value in spec.items() if key not in ('task', 'name')}
+    name = spec.get('name', f"{spec['task']}#{index}")
+    started = time.perf_counter()
+    try:
+        with instrumentation.task(name):
+            result = TASKS[spec['task']](**options)
+        status, detail = 'success', result
+    except Exception as e:
+        status, detail = 'failed', f"{type(e).__name__}: {e}"
+    return {'name': name, 'status': status, 'detail': detail,
+            'duration': time.perf_counter() - started}
+
+
+def run_batch(path, parallel=4, fail_fast=False):
+    """Run every task in a batch file with up to `parallel` at a time"""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    tasks = load_batch_file(path)
+    if parallel > 1:
+        check_destinations(tasks)
+    print(f"\n📦 Batch: {len(tasks)} task(s), parallel={parallel}\n")
+    started = time.perf_counter()
+    outcomes = []
+
+    with ThreadPoolExecutor(max_workers=max(parallel, 1)) as pool:
+        futures = [pool.submit(run_task_spec, i, spec) for i, spec in enumerate(tasks, 1)]
+        for future in as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+            if outcome['status'] == 'failed' and fail_fast:
+                for pending in futures:
+                    pending.cancel()
+                break
+
+    failed = [o for o in outcomes if o['status'] == 'failed']
+    print(f"\n{'='*60}")
+    for outcome in outcomes:
+        icon = '✅' if outcome['status'] == 'success' else '❌'
+        print(f"{icon} {outcome['name']:<25} {outcome['duration']:7.2f}s  {outcome['detail']}")
+    print(f"{'='*60}")
+    print(f"📊 {len(outcomes) - len(failed)} succeeded, {len(failed)} failed, "
+          f"{len(tasks) - len(outcomes)} not run, in {time.perf_counter() - started:.2f}s")
+    return 1 if failed or len(outcomes) < len(tasks) else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description="Task Automation Hub - run without arguments for the interactive menu",
+        argument_default=argparse.SUPPRESS
+    )
+    parser.add_argument('--version', action='version', version=f"%(prog)s {VERSION}")
+    parser.add_argument('--events', metavar='FILE', help="write JSON-lines instrumentation events")
+    parser.add_argument('--profile', metavar='DIR', help="save a cProfile .prof file per task")
+    parser.add_argument('--trace-memory', action='store_true', help="record peak memory per task")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    p = commands.add_parser('organize', help="Organize files into folders", argument_default=argparse.SUPPRESS)
+    p.add_argument('source')
+    p.add_argument('destination')
+    p.add_argument('--by', choices=['extension', 'date', 'size'], help="default: extension")
+
+    p = commands.add_parser('backup', help="Back up a directory", argument_default=argparse.SUPPRESS)
+    p.add_argument('source')
+    p.add_argument('destination')
+    p.add_argument('--type', choices=['full', 'incremental', 'mirror'], help="default: full")
+    p.add_argument('--compression', choices=['zip', 'tar', 'none'], help="default: zip")
+    p.add_argument('--retention', type=int, help="days to keep, 0 = keep all (default: 30)")
+
+    p = commands.add_parser('scrape', help="Scrape data from a web page", argument_default=argparse.SUPPRESS)
+    p.add_argument('url')
+    p.add_argument('--extract', choices=list(SCRAPE_CHOICES), help="default: links")
+    p.add_argument('--selector', help="CSS selector for --extract custom")
+    p.add_argument('--format', choices=['csv', 'json', 'txt'], help="default: json")
+
+    p = commands.add_parser('email', help="Send an email", argument_default=argparse.SUPPRESS)
+    p.add_argument('--smtp-server', required=True)
+    p.add_argument('--smtp-port', type=int, help="default: 587")
+    p.add_argument('--sender', required=True)
+    p.add_argument('--password-env', help="env var holding the password (default: SMTP_PASSWORD)")
+    p.add_argument('--to', required=True, help="comma-separated recipients")
+    p.add_argument('--subject', required=True)
+    body = p.add_mutually_exclusive_group()
+    body.add_argument('--body')
+    body.add_argument('--body-file')
+    p.add_argument('--attach', nargs='+', metavar='FILE')
+
+    p = commands.add_parser('monitor', help="Monitor CPU, RAM, disk and network", argument_default=argparse.SUPPRESS)
+    p.add_argument('--cpu', type=float, help="CPU alert threshold %% (default: 80)")
+    p.add_argument('--ram', type=float, help="RAM alert threshold %% (default: 85)")
+    p.add_argument('--disk', type=float, help="per-disk usage alert threshold %% (default: 90)")
+    p.add_argument('--interval', type=float, help="seconds between samples (default: 60)")
+    p.add_argument('--alert', choices=['console', 'file'], help="default: console")
+    p.add_argument('--port', type=int, help="serve metrics on this port")
+    p.add_argument('--top', type=int, help="top processes to show (default: 5)")
+
+    p = commands.add_parser('schedule', help="Run a script on a schedule", argument_default=argparse.SUPPRESS)
+    p.add_argument('script')
+    when = p.add_mutually_exclusive_group(required=True)
+    when.add_argument('--every-seconds', type=float)
+    when.add_argument('--every-minutes', type=float)
+    when.add_argument('--every-hours', type=float)
+    when.add_argument('--daily', metavar='HH:MM')
+    when.add_argument('--cron', metavar='EXPR', help="e.g. '*/15 9-17 * * mon-fri'")
+    p.add_argument('--workers', type=int, help="worker pool size (default: 4)")
+    p.add_argument('--timeout', type=float, help="seconds per run (default: 300)")
+    p.add_argument('--store', metavar='DB', help="persist jobs and history in this SQLite file")
+    p.add_argument('--catchup', choices=['once', 'all', 'skip'], help="missed runs policy (default: once)")
+    p.add_argument('--warm', type=int, metavar='N', help="use N warm worker processes")
+
+    p = commands.add_parser('batch', help="Run many tasks from a JSON/YAML file")
+    p.add_argument('file')
+    p.add_argument('--parallel', '-j', type=int, default=4, help="tasks to run at once (default: 4)")
+    p.add_argument('--fail-fast', action='store_true', help="stop starting tasks after a failure")
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        app = TaskAutomationHub()
+        app.run()
+        return 0
+
+    parser = build_parser()
+    args = vars(parser.parse_args(argv))
+    command = args.pop('command', None)
+
+    if command is None:
+        parser.print_help()
+        return 2
+
+    events = args.pop('events', None)
+    profile = args.pop('profile', None)
+    trace_memory = args.pop('trace_memory', False)
+    if events or profile or trace_memory:
+        instrumentation.configure(events, profile, trace_memory)
+
+    try:
+        if command == 'batch':
+            return run_batch(args['file'], args['parallel'], args['fail_fast'])
+        with instrumentation.task(command):
+            TASKS[command](**args)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+        return 130
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+    finally:
+        instrumentation.close()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
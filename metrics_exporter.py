@@ -0,0 +1,138 @@
+"""
+Metrics Exporter Module
+Serve System Monitor metrics over HTTP (Prometheus text + JSON history)
+"""
+
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def escape_label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text(sample, active_alerts=()):
+    """Render one monitor sample in Prometheus text exposition format"""
+    lines = []
+
+    def metric(name, help_text, kind, values):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in values:
+            if labels:
+                label_text = ','.join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}")
+            else:
+                lines.append(f"{name} {value}")
+
+    metric('system_cpu_percent', 'CPU usage in percent', 'gauge', [({}, sample['cpu'])])
+    metric('system_ram_percent', 'RAM usage in percent', 'gauge', [({}, sample['ram']['percent'])])
+    metric('system_disk_used_percent', 'Disk usage per mountpoint in percent', 'gauge',
+           [({'device': disk['device'], 'mountpoint': disk['mountpoint']}, disk['percent'])
+            for disk in sample['disks']])
+
+    io_values = []
+    for disk, rates in sample['disk_io'].items():
+        io_values.append(({'disk': disk, 'direction': 'read'}, round(rates['read_bytes'], 2)))
+        io_values.append(({'disk': disk, 'direction': 'write'}, round(rates['write_bytes'], 2)))
+    metric('system_disk_io_bytes_per_second', 'Disk throughput per disk', 'gauge', io_values)
+
+    net_values = []
+    for nic, rates in sample['network'].items():
+        net_values.append(({'nic': nic, 'direction': 'recv'}, round(rates['bytes_recv'], 2)))
+        net_values.append(({'nic': nic, 'direction': 'sent'}, round(rates['bytes_sent'], 2)))
+    metric('system_network_bytes_per_second', 'Network throughput per NIC', 'gauge', net_values)
+
+    processes = sample['processes']
+    metric('system_process_count', 'Number of running processes', 'gauge', [({}, processes['count'])])
+    metric('system_top_process_cpu_percent', 'Top processes by CPU usage', 'gauge',
+           [({'pid': proc['pid'], 'name': proc['name']}, proc['cpu_percent'])
+            for proc in processes['top_cpu']])
+    metric('system_top_process_rss_megabytes', 'Top processes by resident memory', 'gauge',
+           [({'pid': proc['pid'], 'name': proc['name']}, proc['rss_mb'])
+            for proc in processes['top_rss']])
+
+    metric('system_alert_firing', 'Alert rules currently firing', 'gauge',
+           [({'rule': rule}, 1) for rule in active_alerts])
+    metric('system_sample_timestamp_seconds', 'Time of the last sample', 'gauge',
+           [({}, sample['timestamp'])])
+
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsExporter:
+    """Embedded HTTP endpoint for the latest sample and recent history
+
+    Payloads are rendered once per `publish()` call, so any number of
+    scrapers only copy ready-made bytes and never trigger sampling.
+
+        GET /metrics   Prometheus text format
+        GET /history   JSON list of recent samples (oldest first)
+        GET /latest    JSON of the latest sample
+    """
+
+    def __init__(self, host='127.0.0.1', port=9108, history_size=360):
+        self.host = host
+        self.port = port
+        self.history = deque(maxlen=history_size)
+        self.snapshot = {
+            '/metrics': (b'', 'text/plain; version=0.0.4; charset=utf-8'),
+            '/history': (b'[]', 'application/json'),
+            '/latest': (b'{}', 'application/json')
+        }
+        self.server = None
+        self.thread = None
+
+    def publish(self, sample, active_alerts=()):
+        """Precompute all payloads for a new sample"""
+        sample_json = json.dumps(sample, ensure_ascii=False)
+        self.history.append(sample_json)
+
+        # Build a fresh dict and swap the reference so readers never see a half update
+        self.snapshot = {
+            '/metrics': (prometheus_text(sample, active_alerts).encode('utf-8'),
+                         'text/plain; version=0.0.4; charset=utf-8'),
+            '/history': (('[' + ','.join(self.history) + ']').encode('utf-8'), 'application/json'),
+            '/latest': (sample_json.encode('utf-8'), 'application/json')
+        }
+
+    def make_handler(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                entry = exporter.snapshot.get(path)
+                if entry is None:
+                    self.send_error(404, "Try /metrics, /history or /latest")
+                    return
+                body, content_type = entry
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Start serving on a daemon thread"""
+        self.server = ThreadingHTTPServer((self.host, self.port), self.make_handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        print(f"📡 Metrics endpoint: http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        """Stop the HTTP server"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
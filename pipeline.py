@@ -0,0 +1,245 @@
+"""
+Pipeline Module
+Run dependent steps as a DAG on a worker pool
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from instrumentation import span
+
+
+class PipelineStep:
+    """One node of a pipeline
+
+    `func(upstream)` receives {dependency_name: return_value} for its direct
+    dependencies. A step that raises is retried up to `retries` times,
+    waiting `retry_delay` seconds between attempts.
+    """
+
+    def __init__(self, name, func, depends_on=(), retries=0, retry_delay=5):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+
+class Pipeline:
+    """DAG of steps; each step starts as soon as all its dependencies succeed
+
+    Independent branches run in parallel on up to `max_workers` threads.
+    When a step fails for good, everything downstream of it is marked
+    'upstream_failed' while unrelated branches keep running.
+    """
+
+    def __init__(self, name, max_workers=4):
+        self.name = name
+        self.max_workers = max_workers
+        self.steps = {}
+
+    def add_step(self, name, func, depends_on=(), retries=0, retry_delay=5):
+        if name in self.steps:
+            raise ValueError(f"Duplicate step: {name}")
+        step = PipelineStep(name, func, depends_on, retries, retry_delay)
+        self.steps[name] = step
+        return step
+
+    def dependents(self):
+        """Map step name -> names of steps that depend on it"""
+        children = {name: [] for name in self.steps}
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                children[dep].append(step.name)
+        return children
+
+    def validate(self):
+        """Reject unknown dependencies and cycles"""
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'")
+
+        pending = {name: len(step.depends_on) for name, step in self.steps.items()}
+        ready = [name for name, count in pending.items() if count == 0]
+        children = self.dependents()
+        visited = 0
+        while ready:
+            name = ready.pop()
+            visited += 1
+            for child in children[name]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    ready.append(child)
+        if visited != len(self.steps):
+            raise ValueError(f"Pipeline '{self.name}' has a dependency cycle")
+
+    def run_step(self, step, upstream):
+        """Run one step with retries; returns its record"""
+        record = {'status': 'failed', 'attempts': 0, 'error': None, 'result': None,
+                  'started_at': time.time()}
+
+        for attempt in range(step.retries + 1):
+            record['attempts'] = attempt + 1
+            try:
+                with span('pipeline.step', pipeline=self.name, step=step.name, attempt=attempt + 1):
+                    record['result'] = step.func(upstream)
+                record['status'] = 'success'
+                record['error'] = None
+                break
+            except Exception as e:
+                record['error'] = f"{type(e).__name__}: {e}"
+                print(f"  ⚠️  {self.name}/{step.name} attempt {attempt + 1} failed: {record['error']}")
+                if attempt < step.retries:
+                    time.sleep(step.retry_delay)
+
+        record['finished_at'] = time.time()
+        record['duration'] = record['finished_at'] - record['started_at']
+        return record
+
+    def run(self):
+        """Execute the pipeline and return a report dict"""
+        self.validate()
+        children = self.dependents()
+        pending = {name: len(step.depends_on) for name, step in self.steps.items()}
+        records = {}
+        started = time.time()
+
+        print(f"\n🔗 Pipeline '{self.name}' started ({len(self.steps)} steps)")
+
+        def mark_upstream_failed(name, cause):
+            for child in children[name]:
+                if child not in records:
+                    records[child] = {'status': 'upstream_failed', 'attempts': 0,
+                                      'error': f"'{cause}' failed", 'result': None}
+                    mark_upstream_failed(child, cause)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pipeline') as pool:
+            running = {}
+
+            def submit(name):
+                step = self.steps[name]
+                upstream = {dep: records[dep]['result'] for dep in step.depends_on}
+                print(f"  ▶️  {name}")
+                running[pool.submit(self.run_step, step, upstream)] = name
+
+            for name, count in pending.items():
+                if count == 0:
+                    submit(name)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    record = future.result()
+                    records[name] = record
+
+                    if record['status'] == 'success':
+                        print(f"  ✅ {name} ({record['duration']:.2f}s)")
+                        for child in children[name]:
+                            pending[child] -= 1
+                            if pending[child] == 0 and child not in records:
+                                submit(child)
+                    else:
+                        print(f"  ❌ {name} failed after {record['attempts']} attempt(s)")
+                        mark_upstream_failed(name, name)
+
+        finished = time.time()
+        report = {
+            'pipeline': self.name,
+            'status': 'success' if all(r['status'] == 'success' for r in records.values()) else 'failed',
+            'started_at': started,
+            'finished_at': finished,
+            'duration': finished - started,
+            'steps': records
+        }
+        report['critical_path'] = self.critical_path(records, started)
+        self.print_report(report)
+        return report
+
+    def critical_path(self, records, started):
+        """Chain of steps that determined the finish time, from actual timings"""
+        timed = {name: r for name, r in records.items() if 'finished_at' in r}
+        if not timed:
+            return {'steps': [], 'duration': 0.0}
+
+        name = max(timed, key=lambda n: timed[n]['finished_at'])
+        path = [name]
+        while True:
+            deps = [dep for dep in self.steps[name].depends_on if dep in timed]
+            if not deps:
+                break
+            name = max(deps, key=lambda n: timed[n]['finished_at'])
+            path.append(name)
+        path.reverse()
+
+        return {
+            'steps': path,
+            'duration': timed[path[-1]]['finished_at'] - started,
+            'work': sum(timed[n]['duration'] for n in path)
+        }
+
+    def print_report(self, report):
+        started = datetime.fromtimestamp(report['started_at']).strftime('%Y-%m-%d %H:%M:%S')
+        print(f"\n📋 Pipeline '{self.name}' {report['status'].upper()} "
+              f"in {report['duration']:.2f}s (started {started})")
+        for name in self.steps:
+            record = report['steps'].get(name, {'status': 'not_run'})
+            duration = f"{record['duration']:.2f}s" if 'duration' in record else '-'
+            print(f"  {name:<20} {record['status']:<16} {duration:>8}")
+        critical = report['critical_path']
+        if critical['steps']:
+            print(f"  🧭 Critical path: {' → '.join(critical['steps'])} "
+                  f"({critical['duration']:.2f}s, {critical['work']:.2f}s of work)")
+
+
+def nightly_pipeline(config, max_workers=4):
+    """Backup → organize, scrape in parallel, then email a report
+
+    `config` keys: backup {source, destination, compression, retention},
+    organize {source, destination}, scrape {url, choice, format, selector},
+    email {smtp_server, smtp_port, sender, password, recipients, subject}.
+    Modules are imported inside the steps that use them.
+    """
+    pipeline = Pipeline('nightly', max_workers=max_workers)
+
+    def backup(upstream):
+        from backup_manager import BackupManager
+        cfg = config['backup']
+        manager = BackupManager(cfg['source'], cfg['destination'],
+                                cfg.get('compression', 'zip'), cfg.get('retention', 30))
+        backup_path = manager.run_backup('full')
+        if backup_path is None:
+            raise RuntimeError(f"Backup of {cfg['source']} failed")
+        return str(backup_path)
+
+    def organize(upstream):
+        from file_organizer import FileOrganizer
+        cfg = config['organize']
+        moved = FileOrganizer(cfg['source'], cfg['destination']).organize_by_extension()
+        if moved is None:
+            raise RuntimeError(f"Source directory not found: {cfg['source']}")
+        return cfg['destination']
+
+    def scrape(upstream):
+        from web_scraper import WebScraper
+        cfg = config['scrape']
+        scraper = WebScraper(cfg['url'])
+        if not scraper.fetch_page():
+            raise RuntimeError(f"Could not fetch {cfg['url']}")
+        return scraper.scrape_and_save(cfg.get('choice', '3'), cfg.get('selector'), cfg.get('format', 'json'))
+
+    def report(upstream):
+        from email_sender import EmailAutomation
+        cfg = config['email']
+        body = '\n'.join(f"{name}: {value}" for name, value in upstream.items())
+        bot = EmailAutomation(cfg['smtp_server'], cfg['smtp_port'], cfg['sender'], cfg['password'])
+        if not bot.send_email(cfg['recipients'], cfg.get('subject', 'Nightly automation report'), body):
+            raise RuntimeError("Report email could not be sent")
+        return len(cfg['recipients'])
+
+    pipeline.add_step('backup', backup, retries=1)
+    pipeline.add_step('organize', organize, depends_on=['backup'])
+    pipeline.add_step('scrape', scrape, retries=2, retry_delay=30)
+    pipeline.add_step('email_report', report, depends_on=['backup', 'organize', 'scrape'], retries=2)
+    return pipeline
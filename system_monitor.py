@@ -5,16 +5,224 @@ Monitor CPU, RAM, Disk, and Network usage
 
 import psutil
 import time
+import heapq
+from collections import deque
 from datetime import datetime
 import platform
+from alert_engine import AlertEngine, AlertRule, ConsoleSink, FileSink
+from instrumentation import span, count
+
+
+def push_bounded(heap, item, size):
+    """Keep only the `size` largest items in a min-heap"""
+    if len(heap) < size:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+def format_rate(bytes_per_sec):
+    """Human readable bytes/sec"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if bytes_per_sec < 1024:
+            return f"{bytes_per_sec:.1f} {unit}/s"
+        bytes_per_sec /= 1024
+    return f"{bytes_per_sec:.1f} TB/s"
+
+
+class RateTracker:
+    """Turn cumulative psutil counters into per-second rates"""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.last_counters = None
+        self.last_time = None
+
+    def update(self, counters):
+        """Return {name: {field: rate}} since the previous update"""
+        now = time.monotonic()
+        rates = {}
+
+        if self.last_counters is not None and now > self.last_time:
+            elapsed = now - self.last_time
+            for name, value in counters.items():
+                prev = self.last_counters.get(name)
+                if prev is None:
+                    continue
+                rates[name] = {
+                    field: max(getattr(value, field) - getattr(prev, field), 0) / elapsed
+                    for field in self.fields
+                }
+
+        self.last_counters = counters
+        self.last_time = now
+        return rates
+
+
+class ProcessTracker:
+    """Top-N processes by CPU and RSS, built for large process tables
+
+    Reading a process costs a few syscalls, so a tick only reads processes
+    that appeared since the last tick, the current top candidates and the
+    next `reads_per_tick` processes of a rotation; the rest keep their last
+    measured CPU rate and RSS. The first tick therefore reads everything
+    once (so top RSS is complete from the start), after which syscall work
+    per tick is flat apart from process churn, and every process is re-read
+    at least once every len(table) / reads_per_tick ticks. CPU % of a new
+    process shows from its second read. Ranking the cached values is still
+    one pass over the table, but it is pure Python with no syscalls.
+    """
+
+    def __init__(self, top_n=5, reads_per_tick=200):
+        self.top_n = top_n
+        self.reads_per_tick = reads_per_tick
+        self.processes = {}
+        self.names = {}
+        self.stats = {}
+        self.rotation = deque()
+        self.queued = set()
+        self.candidates = set()
+        self.fresh = []
+
+    def forget(self, pid):
+        """Drop all cached state for a PID"""
+        self.processes.pop(pid, None)
+        self.names.pop(pid, None)
+        self.stats.pop(pid, None)
+
+    def refresh_table(self):
+        """Apply the diff between the cached and the current PID set"""
+        current = set(psutil.pids())
+        known = set(self.processes)
+
+        for pid in known - current:
+            self.forget(pid)
+
+        for pid in current - known:
+            try:
+                proc = psutil.Process(pid)
+                self.names[pid] = proc.name()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            self.processes[pid] = proc
+            self.fresh.append(pid)
+            if pid not in self.queued:
+                self.queued.add(pid)
+                self.rotation.append(pid)
+
+    def due_for_read(self):
+        """New processes, top candidates from the last tick and the next rotation slice"""
+        pids = [pid for pid in self.fresh if pid in self.processes]
+        self.fresh = []
+        chosen = set(pids)
+        for pid in self.candidates:
+            if pid in self.processes and pid not in chosen:
+                chosen.add(pid)
+                pids.append(pid)
+        for _ in range(min(self.reads_per_tick, len(self.rotation))):
+            pid = self.rotation.popleft()
+            if pid not in self.processes:
+                # Exited since it was queued
+                self.queued.discard(pid)
+                continue
+            self.rotation.append(pid)
+            if pid not in chosen:
+                chosen.add(pid)
+                pids.append(pid)
+        return pids
+
+    def read(self, pid, now):
+        """Refresh the CPU rate and RSS of one process"""
+        proc = self.processes[pid]
+        try:
+            with proc.oneshot():
+                times = proc.cpu_times()
+                rss = proc.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            self.forget(pid)
+            return
+
+        total = times.user + times.system
+        prev = self.stats.get(pid)
+        if prev is None or total < prev[0]:
+            # New process, or PID reused since the last read
+            if prev is not None:
+                self.names[pid] = self.safe_name(proc)
+            cpu = 0.0
+        elif now > prev[1]:
+            cpu = (total - prev[0]) / (now - prev[1]) * 100
+        else:
+            cpu = prev[2]
+        self.stats[pid] = (total, now, cpu, rss)
+
+    def sample(self):
+        """Return top processes by CPU % and by RSS"""
+        self.refresh_table()
+
+        now = time.monotonic()
+        for pid in self.due_for_read():
+            self.read(pid, now)
+
+        top_cpu = []
+        top_rss = []
+        for pid, (_, _, cpu, rss) in self.stats.items():
+            push_bounded(top_cpu, (cpu, rss, pid), self.top_n)
+            push_bounded(top_rss, (rss, cpu, pid), self.top_n)
+        self.candidates = {pid for _, _, pid in top_cpu} | {pid for _, _, pid in top_rss}
+
+        return {
+            'count': len(self.processes),
+            'top_cpu': [self.describe(pid, cpu, rss)
+                        for cpu, rss, pid in sorted(top_cpu, reverse=True)],
+            'top_rss': [self.describe(pid, cpu, rss)
+                        for rss, cpu, pid in sorted(top_rss, reverse=True)]
+        }
+
+    def safe_name(self, proc):
+        """Process name, or '?' if it can no longer be read"""
+        try:
+            return proc.name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return '?'
+
+    def describe(self, pid, cpu, rss):
+        """Build the report row for one process"""
+        return {
+            'pid': pid,
+            'name': self.names.get(pid, '?'),
+            'cpu_percent': round(cpu, 1),
+            'rss_mb': round(rss / (1024**2), 1)
+        }
+
 
 class SystemMonitor:
-    def __init__(self, cpu_threshold, ram_threshold, alert_method, interval):
+    def __init__(self, cpu_threshold, ram_threshold, alert_method, interval, disk_threshold=90, top_n=5,
+                 alert_window=None, suppress=300, extra_sinks=None, exporter=None):
         self.cpu_threshold = cpu_threshold
         self.ram_threshold = ram_threshold
+        self.disk_threshold = disk_threshold
         self.alert_method = alert_method
         self.interval = interval
         self.log_file = f"system_monitor_{datetime.now().strftime('%Y%m%d')}.log"
+        self.exporter = exporter
+        self.file_sink = FileSink(self.log_file) if alert_method == 'file' else None
+
+        window = alert_window or max(interval * 3, 60)
+        self.alert_window = window
+        self.suppress = suppress
+        self.disk_rules = set()
+        sinks = [ConsoleSink()]
+        if self.file_sink:
+            sinks.append(self.file_sink)
+        sinks.extend(extra_sinks or [])
+        self.alert_engine = AlertEngine([
+            AlertRule('CPU ALERT', 'cpu', cpu_threshold, window=window, suppress=suppress),
+            AlertRule('RAM ALERT', 'ram', ram_threshold, window=window, suppress=suppress)
+        ], sinks)
+
+        self.disk_io_tracker = RateTracker(('read_bytes', 'write_bytes', 'read_count', 'write_count'))
+        self.network_tracker = RateTracker(('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv'))
+        self.process_tracker = ProcessTracker(top_n)
 
     def get_system_info(self):
         """Get system information"""
@@ -39,13 +247,22 @@ class SystemMonitor:
         }
 
     def get_disk_usage(self):
-        """Get disk usage"""
+        """Get disk usage per mountpoint
+
+        One device can be mounted in several places (bind mounts, Docker's
+        /etc/hosts), so partitions are identified by mountpoint.
+        """
         partitions = []
+        seen = set()
         for partition in psutil.disk_partitions():
+            if partition.mountpoint in seen:
+                continue
+            seen.add(partition.mountpoint)
             try:
                 usage = psutil.disk_usage(partition.mountpoint)
                 partitions.append({
                     'device': partition.device,
+                    'mountpoint': partition.mountpoint,
                     'total': f"{usage.total / (1024**3):.2f} GB",
                     'used': f"{usage.used / (1024**3):.2f} GB",
                     'free': f"{usage.free / (1024**3):.2f} GB",
@@ -55,28 +272,71 @@ class SystemMonitor:
                 continue
         return partitions
 
-    def log_message(self, message):
-        """Log message"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_entry = f"[{timestamp}] {message}\n"
+    def get_disk_io_rates(self):
+        """Get per-disk read/write rates"""
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+        return self.disk_io_tracker.update(counters)
+
+    def get_network_rates(self):
+        """Get per-NIC throughput"""
+        counters = psutil.net_io_counters(pernic=True) or {}
+        return self.network_tracker.update(counters)
 
-        if self.alert_method == 'file':
-            with open(self.log_file, 'a') as f:
-                f.write(log_entry)
+    def get_top_processes(self):
+        """Get top-N processes by CPU and RSS"""
+        return self.process_tracker.sample()
 
-        print(log_entry.strip())
+    def collect_sample(self):
+        """Collect one full sample of all metrics"""
+        with span('monitor.sample'):
+            sample = {
+                'timestamp': time.time(),
+                'cpu': self.get_cpu_usage(),
+                'ram': self.get_ram_usage(),
+                'disks': self.get_disk_usage(),
+                'disk_io': self.get_disk_io_rates(),
+                'network': self.get_network_rates(),
+                'processes': self.get_top_processes()
+            }
+        count('samples')
+        return sample
 
-    def check_thresholds(self, cpu_usage, ram_usage):
-        """Check thresholds"""
-        alerts = []
+    def print_sample(self, sample):
+        """Print one sample to the console"""
+        timestamp = datetime.fromtimestamp(sample['timestamp']).strftime('%H:%M:%S')
+        cpu = sample['cpu']
+        ram = sample['ram']
+        print(f"[{timestamp}] CPU: {cpu}% | RAM: {ram['percent']}% ({ram['used']}/{ram['total']})")
 
-        if cpu_usage > self.cpu_threshold:
-            alerts.append(f"⚠️  CPU ALERT: {cpu_usage}% (Threshold: {self.cpu_threshold}%)")
+        for disk in sample['disks']:
+            print(f"  💽 {disk['mountpoint']} ({disk['device']}): {disk['percent']}% used ({disk['free']} free)")
 
-        if ram_usage > self.ram_threshold:
-            alerts.append(f"⚠️  RAM ALERT: {ram_usage}% (Threshold: {self.ram_threshold}%)")
+        for disk, rates in sample['disk_io'].items():
+            print(f"  📀 {disk}: read {format_rate(rates['read_bytes'])} | write {format_rate(rates['write_bytes'])}")
 
-        return alerts
+        for nic, rates in sample['network'].items():
+            print(f"  🌐 {nic}: ↓ {format_rate(rates['bytes_recv'])} | ↑ {format_rate(rates['bytes_sent'])}")
+
+        processes = sample['processes']
+        print(f"  🔝 Top processes ({processes['count']} running):")
+        for proc in processes['top_cpu']:
+            print(f"     {proc['pid']:>7} {proc['name'][:25]:<25} CPU {proc['cpu_percent']:>5}% | RSS {proc['rss_mb']} MB")
+
+    def sample_metrics(self, sample):
+        """Flatten a sample into {metric: percent} for the alert engine
+
+        Disks are only known once sampled, so each new mountpoint gets its
+        own 'DISK ALERT' rule the first time it shows up.
+        """
+        metrics = {'cpu': sample['cpu'], 'ram': sample['ram']['percent']}
+        for disk in sample['disks']:
+            metric = f"disk:{disk['mountpoint']}"
+            if metric not in self.disk_rules:
+                self.disk_rules.add(metric)
+                self.alert_engine.add_rule(AlertRule(f"DISK ALERT {disk['mountpoint']}", metric, self.disk_threshold,
+                                                     window=self.alert_window, suppress=self.suppress))
+            metrics[metric] = disk['percent']
+        return metrics
 
     def monitor(self):
         """Main monitoring loop"""
@@ -87,23 +347,30 @@ class SystemMonitor:
         print(f"Processor: {sys_info['processor']}\n")
         print("⚙️  Monitoring... (Press Ctrl+C to stop)\n")
 
+        if self.exporter:
+            self.exporter.start()
+
         try:
             while True:
-                timestamp = datetime.now().strftime('%H:%M:%S')
-
-                cpu = self.get_cpu_usage()
-                ram = self.get_ram_usage()
+                sample = self.collect_sample()
+                self.print_sample(sample)
 
-                print(f"[{timestamp}] CPU: {cpu}% | RAM: {ram['percent']}% ({ram['used']}/{ram['total']})")
+                self.alert_engine.process(self.sample_metrics(sample), sample['timestamp'])
 
-                alerts = self.check_thresholds(cpu, ram['percent'])
-                for alert in alerts:
-                    self.log_message(alert)
+                active = self.alert_engine.active()
+                if self.exporter:
+                    self.exporter.publish(sample, active)
 
-                if not alerts:
+                if active:
+                    print(f"  🔥 Active alerts: {', '.join(active)}")
+                else:
                     print("  ✅ All systems normal")
 
                 time.sleep(self.interval)
 
         except KeyboardInterrupt:
             print("\n\n🛑 Monitoring stopped")
+        finally:
+            self.alert_engine.close()
+            if self.exporter:
+                self.exporter.stop()
@@ -3,70 +3,332 @@ Task Scheduler Module
 Schedule Python scripts to run automatically
 """
 
-import schedule
 import time
 import subprocess
 import sys
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from scheduler_core import HeapScheduler, IntervalTrigger, CronTrigger, trigger_from_spec
+from job_store import CATCHUP_POLICIES, missed_fire_times
+from warm_pool import WarmWorkerPool
+from instrumentation import count, emit
+
+
+class Job:
+    """A Python script (or a callable) to run, with its own timeout and concurrency limit
+
+    `max_instances` caps how many runs of this job may be queued or running
+    at once; extra runs are skipped instead of piling up. The default of 1
+    means runs of the same job never overlap. `catchup` overrides the
+    scheduler's policy for runs missed while it was stopped. `mode='warm'`
+    runs the script in a pre-started worker instead of a new interpreter.
+    A `func` job runs in the worker thread, fails by raising, cannot be
+    timed out and is not saved in the job store.
+    """
+
+    def __init__(self, name, script_path=None, args=None, timeout=300, max_instances=1, catchup=None,
+                 mode='subprocess', func=None):
+        self.name = name
+        self.script_path = Path(script_path) if script_path is not None else None
+        self.func = func
+        self.args = list(args or [])
+        self.timeout = timeout
+        self.max_instances = max_instances
+        self.catchup = catchup
+        self.mode = mode
+        self.skipped = 0
+
+    def command(self):
+        return [sys.executable, str(self.script_path), *self.args]
+
+
+class JobExecutor:
+    """Run jobs on a bounded worker pool, streaming output to per-run logs"""
+
+    def __init__(self, max_workers=4, log_dir='task_logs', warm_pool=None):
+        self.max_workers = max_workers
+        self.log_dir = Path(log_dir)
+        self.warm_pool = warm_pool
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='task')
+        self.lock = threading.Lock()
+        self.active = {}
+        self.run_count = 0
+        self.listeners = []
+
+    def add_listener(self, callback):
+        """Call `callback(result)` after every finished run"""
+        self.listeners.append(callback)
+
+    def submit(self, job, scheduled_at=None):
+        """Queue a run; returns a Future, or None if the job is at its limit"""
+        scheduled_at = time.time() if scheduled_at is None else scheduled_at
+        return self.submit_many(job, [scheduled_at])
+
+    def submit_many(self, job, scheduled_times):
+        """Queue runs to execute back to back in a single slot
+
+        The Future resolves to the result of the last run.
+        """
+        with self.lock:
+            if self.active.get(job.name, 0) >= job.max_instances:
+                job.skipped += len(scheduled_times)
+                print(f"⏭️  Skipping {job.name}: {job.max_instances} run(s) already active")
+                return None
+            self.active[job.name] = self.active.get(job.name, 0) + 1
+            first_run = self.run_count + 1
+            self.run_count += len(scheduled_times)
+
+        runs = list(enumerate(scheduled_times, first_run))
+        return self.pool.submit(self.execute_runs, job, runs)
+
+    def execute_runs(self, job, runs):
+        """Run a reserved batch, then free the job's slot"""
+        result = None
+        try:
+            for run_number, scheduled_at in runs:
+                result = self.execute(job, run_number, scheduled_at)
+        finally:
+            with self.lock:
+                self.active[job.name] -= 1
+        return result
+
+    def execute(self, job, run_number, scheduled_at):
+        """Run one job and report the result"""
+        result = self.run_job(job, run_number, scheduled_at)
+        count('job_runs')
+        emit('job_run', **result)
+
+        if result['status'] == 'success':
+            print(f"✅ {job.name} #{run_number} completed in {result['duration']:.2f}s")
+        elif result['status'] == 'timeout':
+            print(f"⏱️  {job.name} #{run_number} timed out after {job.timeout}s")
+        else:
+            print(f"❌ {job.name} #{run_number} failed with exit code {result['exit_code']} "
+                  f"(log: {result['log']})")
+
+        for callback in self.listeners:
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"❌ Listener error: {e}")
+        return result
+
+    def log_path(self, job, run_number):
+        job_dir = self.log_dir / job.name
+        job_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return job_dir / f"{timestamp}_run{run_number}.log"
+
+    def run_job(self, job, run_number, scheduled_at):
+        """Run one job in its execution mode and build the result record"""
+        log_path = self.log_path(job, run_number)
+        started = time.time()
+
+        print(f"🚀 Running {job.name} #{run_number} (log: {log_path})")
+
+        if job.func is not None:
+            exit_code, status = self.run_callable(job, log_path)
+        elif job.mode == 'warm' and self.warm_pool:
+            try:
+                exit_code, status = self.warm_pool.run(job.script_path, job.args, job.timeout, log_path)
+            except Exception as e:
+                with open(log_path, 'ab') as log_file:
+                    log_file.write(f"\nError: {e}\n".encode('utf-8'))
+                exit_code, status = None, 'failed'
+        else:
+            exit_code, status = self.run_subprocess(job, log_path)
+
+        finished = time.time()
+        return {
+            'job': job.name,
+            'run': run_number,
+            'scheduled_at': scheduled_at,
+            'started_at': started,
+            'finished_at': finished,
+            'duration': finished - started,
+            'exit_code': exit_code,
+            'status': status,
+            'log': str(log_path)
+        }
+
+    def run_callable(self, job, log_path):
+        """Run a func job in this worker thread; the log gets its result or traceback"""
+        with open(log_path, 'w', encoding='utf-8') as log_file:
+            try:
+                outcome = job.func()
+                log_file.write(f"{outcome}\n")
+                return 0, 'success'
+            except Exception:
+                log_file.write(traceback.format_exc())
+                return 1, 'failed'
+
+    def run_subprocess(self, job, log_path):
+        """Run the job's script with stdout/stderr streamed to a log file"""
+        status = 'failed'
+        exit_code = None
+
+        with open(log_path, 'wb') as log_file:
+            try:
+                process = subprocess.Popen(job.command(), stdout=log_file,
+                                           stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+                try:
+                    exit_code = process.wait(timeout=job.timeout)
+                    status = 'success' if exit_code == 0 else 'failed'
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    exit_code = process.wait()
+                    status = 'timeout'
+            except Exception as e:
+                log_file.write(f"\nError: {e}\n".encode('utf-8'))
+
+        return exit_code, status
+
+    def shutdown(self, wait=True):
+        """Stop accepting work; optionally wait for running jobs"""
+        self.pool.shutdown(wait=wait, cancel_futures=True)
+        if self.warm_pool:
+            self.warm_pool.close()
+
 
 class TaskScheduler:
-    def __init__(self, script_path):
-        self.script_path = Path(script_path)
+    def __init__(self, script_path=None, max_workers=4, log_dir='task_logs', timeout=300,
+                 store=None, catchup='once', warm_workers=0):
+        if catchup not in CATCHUP_POLICIES:
+            raise ValueError(f"catchup must be one of {CATCHUP_POLICIES}")
+
+        self.jobs = {}
         self.task_count = 0
+        warm_pool = WarmWorkerPool(size=warm_workers) if warm_workers else None
+        self.executor = JobExecutor(max_workers, log_dir, warm_pool)
+        self.core = HeapScheduler(self.run_task)
+        self.job = None
+        self.store = store
+        self.catchup = catchup
+
+        if store:
+            self.task_count = store.get_task_count()
+            self.executor.run_count = store.get_last_run_number()
+            self.executor.add_listener(store.record_run)
+            self.restore_jobs()
+
+        if script_path is not None:
+            self.script_path = Path(script_path)
+            if not self.script_path.exists():
+                print(f"❌ Script not found: {script_path}")
+                sys.exit(1)
+            mode = 'warm' if warm_workers else 'subprocess'
+            self.job = self.add_job(Job(self.script_path.stem, self.script_path, timeout=timeout,
+                                        mode=mode))
+
+    def add_job(self, job, trigger=None):
+        """Register a job, optionally scheduling it with an Interval/Cron trigger"""
+        self.jobs[job.name] = job
+        if trigger is not None:
+            next_fire = self.core.add(job.name, trigger, job)
+            if self.store and job.func is None:
+                self.store.save_job(job, trigger, next_fire)
+            next_time = datetime.fromtimestamp(next_fire).strftime('%Y-%m-%d %H:%M:%S')
+            print(f"📅 {job.name}: {trigger.describe()} (next run: {next_time})")
+        return job
 
-        if not self.script_path.exists():
-            print(f"❌ Script not found: {script_path}")
-            sys.exit(1)
+    def add_pipeline(self, pipeline, trigger=None, max_instances=1):
+        """Schedule a Pipeline as a single job that fails if any step fails"""
+        def run_pipeline():
+            report = pipeline.run()
+            if report['status'] != 'success':
+                failed = [name for name, r in report['steps'].items() if r['status'] != 'success']
+                raise RuntimeError(f"Pipeline '{pipeline.name}' failed: {', '.join(failed)}")
+            return report['critical_path']
+
+        pipeline.validate()
+        return self.add_job(Job(pipeline.name, func=run_pipeline, timeout=None,
+                                max_instances=max_instances), trigger)
+
+    def remove_job(self, name):
+        """Unschedule a job and drop it from the store"""
+        self.jobs.pop(name, None)
+        self.core.remove(name)
+        if self.store:
+            self.store.delete_job(name)
+
+    def restore_jobs(self):
+        """Reload stored jobs and apply the catch-up policy to missed runs"""
+        now = time.time()
+        for row in self.store.load_jobs():
+            job = Job(row['name'], row['script_path'], row['args'], row['timeout'],
+                      row['max_instances'], row['catchup'], row['mode'])
+            trigger = trigger_from_spec(row['trigger'])
+            missed, total = missed_fire_times(trigger, row['next_fire'], now)
+
+            self.jobs[job.name] = job
+            next_fire = self.core.add(job.name, trigger, job)
+            self.store.save_job(job, trigger, next_fire)
+            print(f"♻️  Restored {job.name}: {trigger.describe()}")
+
+            if missed:
+                self.catch_up(job, missed, total)
+
+    def catch_up(self, job, missed, total=None):
+        """Handle runs missed while the scheduler was down
+
+        `missed` holds the most recent missed fire times, oldest first;
+        `total` counts all of them, including older ones that were dropped.
+        """
+        policy = job.catchup or self.catchup
+        total = len(missed) if total is None else total
+        print(f"⏪ {job.name}: {total} missed run(s), policy '{policy}'")
+        if total > len(missed):
+            print(f"   Only the last {len(missed)} are handled and recorded individually")
+
+        if policy == 'skip':
+            self.store.record_missed(job.name, missed)
+        elif policy == 'once':
+            self.store.record_missed(job.name, missed[:-1])
+            self.run_task(job, missed[-1])
+        elif self.executor.submit_many(job, missed):
+            self.task_count += len(missed)
+            self.store.mark_dispatched(job.name, self.core.next_fire(job.name), self.task_count)
+
+    def run_task(self, job=None, scheduled_at=None):
+        """Hand a job run to the worker pool without blocking the scheduler"""
+        job = job or self.job
+        future = self.executor.submit(job, scheduled_at)
+        if future is not None:
+            self.task_count += 1
+        if self.store:
+            # Persist skipped fires too, so a restart does not treat them as missed
+            self.store.mark_dispatched(job.name, self.core.next_fire(job.name), self.task_count)
+        if future is None:
+            return None
 
-    def run_task(self):
-        """Execute scheduled task"""
-        self.task_count += 1
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
         print(f"\n{'='*60}")
-        print(f"🚀 Running Task #{self.task_count}")
+        print(f"🚀 Dispatched Task #{self.task_count}: {job.name}")
         print(f"⏰ Time: {timestamp}")
         print(f"{'='*60}\n")
 
-        try:
-            result = subprocess.run(
-                [sys.executable, str(self.script_path)],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-
-            if result.stdout:
-                print(result.stdout)
-
-            if result.returncode == 0:
-                print("\n✅ Task completed successfully")
-            else:
-                print(f"\n❌ Task failed with exit code {result.returncode}")
-                if result.stderr:
-                    print(f"Error: {result.stderr}")
-
-        except subprocess.TimeoutExpired:
-            print("⏱️  Task timeout after 5 minutes")
-        except Exception as e:
-            print(f"❌ Error: {e}")
+        return future
 
     def setup_schedule(self, choice):
         """Setup schedule based on user choice"""
         print("\n⏰ TASK SCHEDULER\n")
 
         if choice == '1':
-            minutes = int(input("Enter interval in minutes: ").strip() or "30")
-            schedule.every(minutes).minutes.do(self.run_task)
-            print(f"✅ Scheduled to run every {minutes} minutes")
+            minutes = float(input("Enter interval in minutes: ").strip() or "30")
+            self.add_job(self.job, IntervalTrigger(minutes * 60))
+            print(f"✅ Scheduled to run every {minutes:g} minutes")
         elif choice == '2':
-            hours = int(input("Enter interval in hours: ").strip() or "1")
-            schedule.every(hours).hours.do(self.run_task)
-            print(f"✅ Scheduled to run every {hours} hours")
+            hours = float(input("Enter interval in hours: ").strip() or "1")
+            self.add_job(self.job, IntervalTrigger(hours * 3600))
+            print(f"✅ Scheduled to run every {hours:g} hours")
         elif choice == '3':
             time_str = input("Enter time (HH:MM format, 24-hour): ").strip() or "09:00"
-            schedule.every().day.at(time_str).do(self.run_task)
+            hour, minute = time_str.split(':')
+            self.add_job(self.job, CronTrigger(f"{int(minute)} {int(hour)} * * *"))
             print(f"✅ Scheduled to run daily at {time_str}")
         elif choice == '4':
             days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
@@ -75,15 +337,27 @@ class TaskScheduler:
             time_str = input("Enter time (HH:MM): ").strip() or "09:00"
 
             day = days[day_num - 1]
-            getattr(schedule.every(), day).at(time_str).do(self.run_task)
+            hour, minute = time_str.split(':')
+            self.add_job(self.job, CronTrigger(f"{int(minute)} {int(hour)} * * {day_num % 7}"))
             print(f"✅ Scheduled to run every {day.capitalize()} at {time_str}")
+        elif choice == '5':
+            print("\nFormat: minute hour day month weekday (e.g. */15 9-17 * * mon-fri)")
+            expression = input("Cron expression: ").strip() or "0 9 * * *"
+            self.add_job(self.job, CronTrigger(expression))
+            print(f"✅ Scheduled with cron '{expression}'")
+
+        self.run_forever()
 
-        print("\n⚙️  Scheduler running... (Press Ctrl+C to stop)\n")
+    def run_forever(self):
+        """Dispatch due jobs until Ctrl+C"""
+        print(f"\n⚙️  Scheduler running with {self.executor.max_workers} workers... (Press Ctrl+C to stop)\n")
 
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
+            self.core.run()
         except KeyboardInterrupt:
-            print(f"\n\n🛑 Scheduler stopped")
-            print(f"📊 Total tasks executed: {self.task_count}")
+            self.core.stop()
+            print(f"\n\n🛑 Scheduler stopped, waiting for running tasks...")
+            self.executor.shutdown(wait=True)
+            if self.store:
+                self.store.close()
+            print(f"📊 Total tasks dispatched: {self.task_count}")
@@ -0,0 +1,58 @@
+"""
+Tests for alert_engine suppression behaviour
+Run: python -m unittest test_alert_engine
+"""
+
+import unittest
+
+from alert_engine import AlertRule
+
+
+def feed(rule, samples):
+    """Evaluate (timestamp, value) pairs; return the alerts emitted"""
+    alerts = []
+    for timestamp, value in samples:
+        alert = rule.evaluate(value, timestamp)
+        if alert:
+            alerts.append(alert)
+    return alerts
+
+
+class SuppressionTest(unittest.TestCase):
+    def make_rule(self):
+        # 1s window with 1s samples: the aggregate is the latest value
+        return AlertRule('CPU ALERT', 'cpu', 90, window=1, suppress=300)
+
+    def test_flap_then_sustained_high_is_reported_after_suppress(self):
+        rule = self.make_rule()
+        alerts = feed(rule, [(0, 50), (2, 95), (6, 50)])
+        self.assertEqual([a['state'] for a in alerts], ['firing', 'resolved'])
+
+        # Flaps back up inside the suppression window, then stays high for an hour
+        alerts = feed(rule, [(t, 95) for t in range(7, 3600)])
+
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0]['state'], 'firing')
+        self.assertEqual(alerts[0]['suppressed'], 1)
+        # Suppression counts from the 'firing' at t=2, not the resolve at t=6
+        self.assertEqual(alerts[0]['timestamp'], 302)
+        self.assertTrue(rule.firing and rule.episode_notified)
+
+    def test_suppressed_episode_that_clears_stays_silent(self):
+        rule = self.make_rule()
+        feed(rule, [(0, 50), (2, 95), (6, 50)])
+        alerts = feed(rule, [(7, 95), (8, 95), (9, 50), (400, 50)])
+        self.assertEqual(alerts, [])
+        self.assertEqual(rule.suppressed, 1)
+
+    def test_resolve_does_not_restart_suppression(self):
+        rule = self.make_rule()
+        feed(rule, [(0, 50), (2, 95), (250, 50)])
+        # 300s after the firing at t=2, even though the resolve was at t=250
+        alerts = feed(rule, [(302, 95)])
+        self.assertEqual([a['state'] for a in alerts], ['firing'])
+        self.assertEqual(alerts[0]['suppressed'], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
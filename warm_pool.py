@@ -0,0 +1,302 @@
+"""
+Warm Worker Pool Module
+Run Python scripts in pre-started, pre-imported worker processes
+"""
+
+import multiprocessing
+import os
+import queue
+import runpy
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from pathlib import Path
+
+DEFAULT_PRELOAD = ('json', 'csv', 'datetime', 'pathlib', 'shutil', 'subprocess')
+
+
+def current_rss():
+    """Resident memory of this process in bytes (best effort)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return 0
+
+
+def snapshot_modules(roots):
+    """Copy the namespaces of the `roots` modules and their submodules"""
+    return {name: dict(vars(module)) for name, module in list(sys.modules.items())
+            if module is not None and name.partition('.')[0] in roots}
+
+
+def restore_modules(loaded, namespaces):
+    """Forget modules imported since `loaded` and undo rebinding in `namespaces`"""
+    for name in list(sys.modules):
+        if name not in loaded:
+            del sys.modules[name]
+    for name, saved in namespaces.items():
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        current = vars(module)
+        for key in [key for key in current if key not in saved]:
+            del current[key]
+        for key, value in saved.items():
+            if current.get(key, saved) is not value:
+                current[key] = value
+
+
+def run_script(script_path, args, log_path, guarded=DEFAULT_PRELOAD):
+    """Execute a script like `python script.py args`, output to log_path
+
+    The script runs with __name__ == '__main__', so its usual
+    `if __name__ == "__main__": main()` entry point is what gets called,
+    and with its own directory first on sys.path. Afterwards sys.path,
+    sys.argv, the working directory and os.environ are restored, modules the
+    script imported are dropped so the next run re-imports them fresh, and
+    attributes rebound on the `guarded` (preloaded) modules are put back.
+
+    Still shared between runs: in-place changes to objects owned by modules
+    that were loaded before the run (e.g. mutating a list in `os` or
+    patching `sys.excepthook`), threads the script left running, signal
+    handlers, open file descriptors and atexit handlers (which never run).
+    """
+    script_path = os.path.abspath(script_path)
+    saved_argv = sys.argv
+    saved_path = sys.path[:]
+    saved_environ = dict(os.environ)
+    saved_cwd = os.getcwd()
+    loaded = set(sys.modules)
+    namespaces = snapshot_modules(guarded)
+    saved_fds = (os.dup(1), os.dup(2))
+    exit_code = 0
+
+    with open(log_path, 'ab') as log_file:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(log_file.fileno(), 1)
+        os.dup2(log_file.fileno(), 2)
+        try:
+            sys.argv = [script_path, *args]
+            sys.path.insert(0, os.path.dirname(script_path))
+            runpy.run_path(script_path, run_name='__main__')
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                print(e.code, file=sys.stderr)
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            os.close(saved_fds[0])
+            os.close(saved_fds[1])
+            sys.argv = saved_argv
+            sys.path[:] = saved_path
+            if dict(os.environ) != saved_environ:
+                os.environ.clear()
+                os.environ.update(saved_environ)
+            os.chdir(saved_cwd)
+            restore_modules(loaded, namespaces)
+
+    return exit_code
+
+
+def worker_main(conn, preload):
+    """Worker loop: receive (script, args, log_path), reply (exit_code, rss)"""
+    # runpy.run_path imports pkgutil on first use; load it now so it is not
+    # dropped and re-imported after every run
+    for name in ('pkgutil', *preload):
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+    conn.send(current_rss())
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        script_path, args, log_path = message
+        exit_code = run_script(script_path, args, log_path, preload)
+        conn.send((exit_code, current_rss()))
+
+
+class WarmWorker:
+    def __init__(self, context, preload):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=worker_main, args=(child_conn, preload), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.baseline_rss = self.conn.recv()
+        self.rss = self.baseline_rss
+        self.runs = 0
+
+    def stop(self, force=False):
+        if not force:
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=2)
+            except (OSError, EOFError):
+                pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class WarmWorkerPool:
+    """Pool of pre-started Python workers that skip interpreter startup
+
+    Each worker imports `preload` once, then runs many scripts; see
+    run_script() for how runs are isolated from each other. A worker is
+    replaced after `max_runs` runs, when its RSS grew more than
+    `max_memory_growth_mb` since start, when it crashes, or when a run
+    exceeds its timeout (the worker is killed).
+    """
+
+    def __init__(self, size=2, max_runs=100, max_memory_growth_mb=100, preload=DEFAULT_PRELOAD):
+        methods = multiprocessing.get_all_start_methods()
+        self.context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        if 'forkserver' in methods:
+            self.context.set_forkserver_preload(list(preload))
+
+        self.size = size
+        self.max_runs = max_runs
+        self.max_memory_growth = max_memory_growth_mb * 1024 * 1024
+        self.preload = tuple(preload)
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.workers = set()
+        self.recycled = 0
+        self.closed = False
+
+        for _ in range(size):
+            self.idle.put(self.spawn())
+
+    def spawn(self):
+        worker = WarmWorker(self.context, self.preload)
+        with self.lock:
+            self.workers.add(worker)
+        return worker
+
+    def retire(self, worker, force=False):
+        with self.lock:
+            self.workers.discard(worker)
+            self.recycled += 1
+        worker.stop(force=force)
+
+    def run(self, script_path, args, timeout, log_path):
+        """Run a script on an idle worker; returns (exit_code, status)"""
+        worker = self.idle.get()
+        replace = False
+        try:
+            try:
+                worker.conn.send((str(script_path), list(args), str(log_path)))
+                if worker.conn.poll(timeout):
+                    exit_code, worker.rss = worker.conn.recv()
+                    status = 'success' if exit_code == 0 else 'failed'
+                else:
+                    self.retire(worker, force=True)
+                    replace = True
+                    return -9, 'timeout'
+            except (EOFError, OSError):
+                # Worker died mid-run (segfault, os._exit, OOM kill)
+                worker.process.join(timeout=1)
+                exit_code = worker.process.exitcode
+                self.retire(worker, force=True)
+                replace = True
+                return exit_code if exit_code is not None else -1, 'failed'
+
+            worker.runs += 1
+            if (worker.runs >= self.max_runs
+                    or worker.rss - worker.baseline_rss > self.max_memory_growth):
+                self.retire(worker)
+                replace = True
+            return exit_code, status
+        finally:
+            if not self.closed:
+                self.idle.put(self.spawn() if replace else worker)
+
+    def close(self):
+        """Stop every worker"""
+        self.closed = True
+        with self.lock:
+            workers = list(self.workers)
+            self.workers.clear()
+        for worker in workers:
+            worker.stop()
+
+
+def latency_summary(samples):
+    samples = sorted(samples)
+    return {
+        'mean_ms': sum(samples) / len(samples) * 1000,
+        'p50_ms': samples[len(samples) // 2] * 1000,
+        'p95_ms': samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1000
+    }
+
+
+def benchmark_warm_pool(script_path=None, runs=50, workers=2):
+    """Compare per-run latency of subprocess launches vs the warm pool"""
+    import subprocess
+
+    script_path = Path(script_path or Path(__file__).parent / 'test_script.py')
+    log_dir = Path(tempfile.mkdtemp(prefix='warm_bench_'))
+    log_path = log_dir / 'run.log'
+
+    cold = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        with open(log_path, 'ab') as log_file:
+            subprocess.run([sys.executable, str(script_path)], stdout=log_file, stderr=subprocess.STDOUT)
+        cold.append(time.perf_counter() - start)
+
+    pool = WarmWorkerPool(size=workers)
+    warm = []
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            pool.run(script_path, [], 60, log_path)
+            warm.append(time.perf_counter() - start)
+    finally:
+        pool.close()
+
+    results = {
+        'script': str(script_path),
+        'runs': runs,
+        'subprocess': latency_summary(cold),
+        'warm_pool': latency_summary(warm)
+    }
+    results['speedup'] = results['subprocess']['mean_ms'] / results['warm_pool']['mean_ms']
+
+    print("\n🔥 WARM POOL BENCHMARK\n")
+    print(f"  Script: {script_path.name} x {runs} runs")
+    for mode in ('subprocess', 'warm_pool'):
+        stats = results[mode]
+        print(f"  {mode:<11} mean {stats['mean_ms']:7.2f} ms | p50 {stats['p50_ms']:7.2f} ms | p95 {stats['p95_ms']:7.2f} ms")
+    print(f"  Speedup: {results['speedup']:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_warm_pool()
@@ -7,7 +7,9 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import csv
+import uuid
 from datetime import datetime
+from instrumentation import span, count
 
 class WebScraper:
     def __init__(self, url):
@@ -20,9 +22,13 @@ class WebScraper:
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             }
-            response = requests.get(self.url, headers=headers, timeout=10)
-            response.raise_for_status()
-            self.soup = BeautifulSoup(response.content, 'html.parser')
+            with span('scrape.fetch', url=self.url):
+                response = requests.get(self.url, headers=headers, timeout=10)
+                response.raise_for_status()
+            count('pages')
+            count('bytes', len(response.content))
+            with span('scrape.parse', url=self.url):
+                self.soup = BeautifulSoup(response.content, 'html.parser')
             print(f"✅ Page fetched successfully!")
             return True
         except Exception as e:
@@ -100,41 +106,46 @@ class WebScraper:
         return elements
 
     def save_data(self, data, format_type):
-        """Save scraped data"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"scraped_data_{timestamp}.{format_type}"
+        """Save scraped data to a new, uniquely named file"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        filename = f"scraped_data_{timestamp}_{uuid.uuid4().hex[:6]}.{format_type}"
 
+        # 'x' mode: never overwrite another scrape's output
         if format_type == 'csv' and data and isinstance(data[0], dict):
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
+            with open(filename, 'x', newline='', encoding='utf-8') as f:
                 writer = csv.DictWriter(f, fieldnames=data[0].keys())
                 writer.writeheader()
                 writer.writerows(data)
         elif format_type == 'json':
-            with open(filename, 'w', encoding='utf-8') as f:
+            with open(filename, 'x', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
         else:
-            with open(filename, 'w', encoding='utf-8') as f:
+            with open(filename, 'x', encoding='utf-8') as f:
                 for item in data:
                     f.write(str(item) + '\n\n')
 
         print(f"✅ Data saved to: {filename}")
+        return filename
 
     def scrape_and_save(self, scrape_choice, css_selector, output_format):
         """Main scraping function"""
         data = []
 
-        if scrape_choice == '1':
-            data = self.scrape_all_text()
-        elif scrape_choice == '2':
-            data = self.scrape_headings()
-        elif scrape_choice == '3':
-            data = self.scrape_links()
-        elif scrape_choice == '4':
-            data = self.scrape_images()
-        elif scrape_choice == '5':
-            data = self.scrape_tables()
-        elif scrape_choice == '6':
-            data = self.scrape_custom(css_selector)
+        with span('scrape.extract', choice=scrape_choice):
+            if scrape_choice == '1':
+                data = self.scrape_all_text()
+            elif scrape_choice == '2':
+                data = self.scrape_headings()
+            elif scrape_choice == '3':
+                data = self.scrape_links()
+            elif scrape_choice == '4':
+                data = self.scrape_images()
+            elif scrape_choice == '5':
+                data = self.scrape_tables()
+            elif scrape_choice == '6':
+                data = self.scrape_custom(css_selector)
 
         print(f"\n✓ Found {len(data)} items")
-        self.save_data(data, output_format)
+        count('items', len(data))
+        with span('scrape.save', format=output_format):
+            return self.save_data(data, output_format)